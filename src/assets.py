@@ -0,0 +1,108 @@
+import hashlib
+import json
+import os
+
+from discovery import DEFAULT_IGNORE, scan_tree
+from manifest import hash_file
+from static_sync import is_current, place_file
+
+FINGERPRINTED = (".css", ".js", ".png", ".jpg", ".jpeg", ".gif", ".svg", ".webp", ".avif", ".woff", ".woff2")
+HASH_LENGTH = 10
+
+
+def fingerprinted_name(relative, digest):
+
+    """index.css + digest -> index.<first HASH_LENGTH hex digits>.css"""
+
+    base, extension = os.path.splitext(relative)
+    return f"{base}.{digest[:HASH_LENGTH]}{extension}"
+
+
+def url_for(relative):
+    return "/" + relative.replace(os.sep, "/")
+
+
+class AssetManifest():
+
+    """
+    Fingerprints static assets by content hash. update() places a copy (or
+    hard link) of every synced asset under a fingerprinted name next to the
+    original, and urls() maps root-relative asset urls to those names so
+    references can be rewritten. Hashes are cached by size and mtime in the
+    record at path, and fingerprinted files of old asset versions are
+    removed. Originals stay in place for relative and external references.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self.entries = {}
+        self.load()
+
+    def load(self):
+        if self.path is None or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.entries = json.load(f)
+        except (OSError, ValueError):
+            self.entries = {}
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def update(self, static_dir, dest_dir, link=False, ignore=DEFAULT_IGNORE):
+
+        """
+        Fingerprint the synced copies in dest_dir of the assets in static_dir,
+        so the hash covers what is actually served (e.g. minified CSS).
+        ignore must match the patterns sync_tree was given, so that only
+        synced assets are fingerprinted. Returns (written, removed) paths.
+        """
+
+        previous = self.entries
+        self.entries = {}
+        written = []
+
+        for source in scan_tree(static_dir, ignore):
+            relative = source.relative
+            if not relative.lower().endswith(FINGERPRINTED):
+                continue
+            synced = os.path.join(dest_dir, relative)
+            stat = os.stat(synced)
+
+            entry = previous.get(relative)
+            if entry is None or entry["size"] != stat.st_size or entry["mtime_ns"] != stat.st_mtime_ns:
+                entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "hash": hash_file(synced)}
+            entry["output"] = fingerprinted_name(relative, entry["hash"])
+            self.entries[relative] = entry
+
+            output = os.path.join(dest_dir, entry["output"])
+            if not is_current(stat, output):
+                place_file(synced, output, link)
+                written.append(output)
+
+        outputs = {entry["output"] for entry in self.entries.values()}
+        removed = []
+        for entry in previous.values():
+            output = entry.get("output")
+            if output and output not in outputs:
+                path = os.path.join(dest_dir, output)
+                if os.path.lexists(path):
+                    os.remove(path)
+                    removed.append(path)
+
+        if self.path is not None:
+            self.save()
+        return written, removed
+
+    def urls(self):
+        return {url_for(relative): url_for(entry["output"]) for relative, entry in self.entries.items()}
+
+    def digest(self):
+        return hashlib.sha256(json.dumps(self.urls(), sort_keys=True).encode("utf-8")).hexdigest()[:16]
@@ -0,0 +1,8 @@
+"""Micro and end-to-end benchmarks for the site generator.
+
+Run from the src directory:
+
+    python3 -m benchmarks --pages 500 --output bench.json   # stage and build timings
+    python3 -m benchmarks.corpus /tmp/site --pages 1000     # just write a corpus
+    python3 -m benchmarks.nodes                             # per-node memory and cost
+"""
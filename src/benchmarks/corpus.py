@@ -0,0 +1,165 @@
+import argparse
+import os
+import random
+
+DEFAULT_BLOCK_MIX = {
+    "paragraph": 6,
+    "heading": 2,
+    "code": 1,
+    "quote": 1,
+    "unordered": 1,
+    "ordered": 1,
+}
+
+WORDS = ("elf", "ring", "shire", "balrog", "mithril", "wizard", "river", "tower",
+         "ranger", "forest", "mountain", "dragon", "hobbit", "road", "song", "stone",
+         "king", "sword", "lamp", "council", "harbour", "valley", "ancient", "bright")
+
+TEMPLATE = """<!doctype html>
+<html>
+  <head>
+    <title>{{ Title }}</title>
+    <link href="/index.css" rel="stylesheet" />
+  </head>
+  <body>
+    <article>{{ Content }}</article>
+  </body>
+</html>"""
+
+
+def make_inline(rng, words, inline_density):
+
+    """A sentence of words where roughly inline_density of them carry markup"""
+
+    parts = []
+    for _ in range(words):
+        word = rng.choice(WORDS)
+        if rng.random() < inline_density:
+            kind = rng.randrange(5)
+            if kind == 0:
+                word = f"**{word}**"
+            elif kind == 1:
+                word = f"_{word}_"
+            elif kind == 2:
+                word = f"`{word}`"
+            elif kind == 3:
+                word = f"[{word}](/{rng.choice(WORDS)}/{word})"
+            else:
+                word = f"![{word}](/images/{word}.png)"
+        parts.append(word)
+    return " ".join(parts) + "."
+
+
+def make_block(rng, kind, inline_density):
+    if kind == "heading":
+        return "#" * rng.randint(2, 4) + " " + make_inline(rng, 4, inline_density)
+    if kind == "code":
+        lines = [f"{rng.choice(WORDS)} = \"{rng.choice(WORDS)}\"" for _ in range(rng.randint(2, 8))]
+        return "```\n" + "\n".join(lines) + "\n```"
+    if kind == "quote":
+        return "\n".join("> " + make_inline(rng, 10, inline_density) for _ in range(rng.randint(1, 3)))
+    if kind == "unordered":
+        return "\n".join("- " + make_inline(rng, 6, inline_density) for _ in range(rng.randint(2, 6)))
+    if kind == "ordered":
+        return "\n".join(f"{i}. " + make_inline(rng, 6, inline_density) for i in range(1, rng.randint(3, 7)))
+    return "\n".join(make_inline(rng, 12, inline_density) for _ in range(rng.randint(1, 4)))
+
+
+def make_page(rng, title, blocks, block_mix, inline_density):
+    kinds = list(block_mix)
+    weights = [block_mix[kind] for kind in kinds]
+    body = [make_block(rng, kind, inline_density) for kind in rng.choices(kinds, weights, k=blocks)]
+    return f"# {title}\n\n" + "\n\n".join(body) + "\n"
+
+
+def page_path(index, depth, fanout):
+    parts = []
+    value = index
+    for level in range(depth):
+        parts.append(f"section{level}-{value % fanout}")
+        value //= fanout
+    parts.append(f"page{index}")
+    return os.path.join(*parts, "index.md")
+
+
+def generate_corpus(root, pages=100, blocks_per_page=40, block_mix=None, inline_density=0.1,
+                    depth=2, fanout=8, seed=0):
+
+    """
+    Write a synthetic site (content/, static/ and template.html) under root.
+    The same arguments always produce the same corpus. Returns the list of
+    markdown paths written.
+    """
+
+    rng = random.Random(seed)
+    block_mix = block_mix or DEFAULT_BLOCK_MIX
+    content_dir = os.path.join(root, "content")
+    written = []
+
+    for index in range(pages):
+        path = os.path.join(content_dir, page_path(index, depth, fanout))
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(make_page(rng, f"Page {index}", blocks_per_page, block_mix, inline_density))
+        written.append(path)
+
+    static_dir = os.path.join(root, "static", "images")
+    os.makedirs(static_dir, exist_ok=True)
+    with open(os.path.join(root, "static", "index.css"), "w", encoding="utf-8") as f:
+        f.write("body { font-family: serif; }\n")
+    for word in WORDS:
+        with open(os.path.join(static_dir, f"{word}.png"), "wb") as f:
+            f.write(rng.randbytes(2048))
+
+    with open(os.path.join(root, "template.html"), "w", encoding="utf-8") as f:
+        f.write(TEMPLATE)
+
+    return written
+
+
+def parse_block_mix(text):
+
+    """Parse "paragraph=6,code=1" into a block mix dict"""
+
+    mix = {}
+    for item in text.split(","):
+        kind, _, weight = item.partition("=")
+        if kind not in DEFAULT_BLOCK_MIX:
+            raise ValueError(f"Unknown block type {kind!r}, expected one of {sorted(DEFAULT_BLOCK_MIX)}")
+        mix[kind] = float(weight)
+    return mix
+
+
+def add_corpus_arguments(parser):
+    parser.add_argument("--pages", type=int, default=200, help="number of pages (default: 200)")
+    parser.add_argument("--blocks", type=int, default=40, help="blocks per page (default: 40)")
+    parser.add_argument("--block-mix", type=parse_block_mix, default=None,
+                        help="block weights, e.g. paragraph=6,heading=2,code=1")
+    parser.add_argument("--inline-density", type=float, default=0.1,
+                        help="fraction of words with inline markup (default: 0.1)")
+    parser.add_argument("--depth", type=int, default=2, help="directory depth (default: 2)")
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def corpus_options(args):
+    return {
+        "pages": args.pages,
+        "blocks_per_page": args.blocks,
+        "block_mix": args.block_mix or DEFAULT_BLOCK_MIX,
+        "inline_density": args.inline_density,
+        "depth": args.depth,
+        "seed": args.seed,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generate a synthetic site corpus")
+    parser.add_argument("root", help="directory to write content/, static/ and template.html into")
+    add_corpus_arguments(parser)
+    args = parser.parse_args(argv)
+    written = generate_corpus(args.root, **corpus_options(args))
+    print(f"Wrote {len(written)} pages under {args.root}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+import sys
+import timeit
+import tracemalloc
+
+from htmlnode import LeafNode, ParentNode
+from textnode import TextNode, TextType
+
+COUNT = 100_000
+
+
+def make_text_nodes():
+    return [TextNode("word", TextType.TEXT) for _ in range(COUNT)]
+
+
+def make_leaf_nodes():
+    return [LeafNode("b", "word") for _ in range(COUNT)]
+
+
+def make_parent_nodes():
+    return [ParentNode("li", []) for _ in range(COUNT)]
+
+
+def measure(factory):
+
+    """Return (bytes per node, microseconds per node) for a node factory"""
+
+    tracemalloc.start()
+    nodes = factory()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del nodes
+
+    seconds = min(timeit.repeat(factory, number=1, repeat=5))
+    return size / COUNT, seconds / COUNT * 1e6
+
+
+def main():
+    for name, factory in [("TextNode", make_text_nodes),
+                          ("LeafNode", make_leaf_nodes),
+                          ("ParentNode", make_parent_nodes)]:
+        per_node, per_us = measure(factory)
+        print(f"{name:<12}{per_node:8.1f} bytes/node{per_us:8.3f} us/node")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,118 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+
+import main as site
+from benchmarks.corpus import add_corpus_arguments, corpus_options, generate_corpus
+from inline_markdown import text_to_textnodes
+from markdown_to_blocks import (BlockType, block_to_block_type, extract_text_content,
+                                markdown_to_blocks, markdown_to_html_node)
+
+
+def best_of(repeat, func):
+
+    """Run func repeat times and return the fastest wall-clock time in seconds"""
+
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def stage_result(seconds, pages, size):
+    return {
+        "seconds": seconds,
+        "pages_per_second": pages / seconds if seconds else None,
+        "mb_per_second": size / seconds / 1e6 if seconds else None,
+    }
+
+
+def run_build(root, argv):
+    previous = os.getcwd()
+    os.chdir(root)
+    try:
+        site.main(argv)
+    finally:
+        os.chdir(previous)
+
+
+def run_suite(root, repeat=3, workers=1):
+
+    """Time each pipeline stage and the end-to-end build over the corpus in root"""
+
+    pages = [source for source, _ in site.discover_pages(os.path.join(root, "content"), "public")]
+    texts = []
+    for source in pages:
+        with open(source, "r", encoding="utf-8") as f:
+            texts.append(f.read())
+    size = sum(len(text.encode("utf-8")) for text in texts)
+
+    paragraphs = []
+    for text in texts:
+        for block in markdown_to_blocks(text):
+            if block_to_block_type(block) == BlockType.PARA:
+                paragraphs.append(extract_text_content(block, BlockType.PARA))
+    nodes = [markdown_to_html_node(text) for text in texts]
+
+    stages = {
+        "markdown_to_blocks": lambda: [markdown_to_blocks(text) for text in texts],
+        "text_to_textnodes": lambda: [text_to_textnodes(text) for text in paragraphs],
+        "markdown_to_html_node": lambda: [markdown_to_html_node(text) for text in texts],
+        "to_html": lambda: [node.to_html() for node in nodes],
+        "build_full": lambda: run_build(root, ["--clean", "--no-cache", "--log-level", "warning", "-j", str(workers)]),
+        "build_cached": lambda: run_build(root, ["--clean", "--log-level", "warning", "-j", str(workers)]),
+        "build_noop": lambda: run_build(root, ["--log-level", "warning", "-j", str(workers)]),
+    }
+
+    results = {}
+    for name, func in stages.items():
+        results[name] = stage_result(best_of(repeat, func), len(texts), size)
+    return {"pages": len(texts), "bytes": size, "stages": results}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the site generator on a synthetic corpus")
+    add_corpus_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=3, help="runs per stage, best is kept (default: 3)")
+    parser.add_argument("-j", "--workers", type=int, default=1, help="workers for the build stages (default: 1)")
+    parser.add_argument("--output", help="write the results as JSON to this path")
+    args = parser.parse_args(argv)
+
+    options = corpus_options(args)
+    with tempfile.TemporaryDirectory() as root:
+        generate_corpus(root, **options)
+        report = run_suite(root, args.repeat, args.workers)
+
+    report.update({
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "workers": args.workers,
+        "corpus": options,
+    })
+
+    print(f"{report['pages']} pages, {report['bytes'] / 1e6:.2f} MB of markdown")
+    for name, result in report["stages"].items():
+        print(f"{name:<24}{result['seconds'] * 1000:10.1f} ms"
+              f"{result['pages_per_second']:10.0f} pages/s{result['mb_per_second']:8.2f} MB/s")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+from collections import OrderedDict
+
+DEFAULT_MAX_ENTRIES = 4096
+
+
+class BlockMemo():
+
+    """
+    Bounded LRU memo of rendered blocks keyed on the block's markdown text.
+    Values are whatever blocks_to_html_node stores (the rendered fragment and
+    the block's metadata). A memo is only valid for one basepath and asset
+    configuration, so keep one per build (and per worker process).
+    """
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, block):
+        entry = self.entries.get(block)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(block)
+        self.hits += 1
+        return entry
+
+    def put(self, block, entry):
+        self.entries[block] = entry
+        self.entries.move_to_end(block)
+        if len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self.entries)}
@@ -0,0 +1,109 @@
+import json
+import os
+import time
+from time import perf_counter
+
+PHASES = ("read", "blocks", "inline", "render", "template", "minify", "write")
+
+
+class PageTimer():
+
+    """Accumulates the seconds one page spends in each build phase, plus counters"""
+
+    __slots__ = ("phases", "counters")
+
+    def __init__(self):
+        self.phases = dict.fromkeys(PHASES, 0.0)
+        self.counters = {}
+
+    def add(self, phase, seconds):
+        self.phases[phase] += seconds
+
+    def count(self, name, amount=1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def timed(self, phase, func):
+
+        """Wrap func so every call is added to phase"""
+
+        def wrapper(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.phases[phase] += perf_counter() - start
+        return wrapper
+
+    def timed_chunks(self, phase, chunks):
+
+        """Yield from chunks, adding the time spent producing them to phase"""
+
+        iterator = iter(chunks)
+        while True:
+            start = perf_counter()
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                self.phases[phase] += perf_counter() - start
+                return
+            self.phases[phase] += perf_counter() - start
+            yield chunk
+
+
+class BuildReport():
+
+    """
+    Collects per-page phase timings and static sync totals for one build
+    and turns them into a JSON-serialisable summary.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.start = perf_counter()
+        self.seconds = None
+        self.pages = {}
+        self.skipped = 0
+        self.removed = 0
+        self.static = {"copied": 0, "removed": 0, "seconds": 0.0}
+        self.counters = {}
+
+    def add_page(self, source, phases, counters=None):
+        self.pages[source] = phases
+        for name, amount in (counters or {}).items():
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def set_static(self, copied, removed, seconds):
+        self.static = {"copied": copied, "removed": removed, "seconds": seconds}
+
+    def finish(self):
+        self.seconds = perf_counter() - self.start
+
+    def totals(self):
+        totals = dict.fromkeys(PHASES, 0.0)
+        for phases in self.pages.values():
+            for phase, seconds in phases.items():
+                totals[phase] += seconds
+        return totals
+
+    def slowest(self, count=10):
+        ranked = sorted(self.pages.items(), key=lambda item: sum(item[1].values()), reverse=True)
+        return [{"source": source, "seconds": sum(phases.values()), "phases": phases}
+                for source, phases in ranked[:count]]
+
+    def summary(self, slowest=10):
+        return {
+            "started": self.started,
+            "seconds": self.seconds,
+            "pages": {"built": len(self.pages), "skipped": self.skipped, "removed": self.removed},
+            "phases": self.totals(),
+            "static": self.static,
+            "counters": self.counters,
+            "slowest": self.slowest(slowest),
+        }
+
+    def write(self, path, slowest=10):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.summary(slowest), f, indent=2)
@@ -0,0 +1,245 @@
+import logging
+import os
+import threading
+import time
+from time import perf_counter
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+from discovery import DEFAULT_IGNORE, scan_tree
+from main import generate_pages_recursive, is_markdown, output_key, page_dest_path, render_page, static_transforms
+from manifest import hash_file
+from static_sync import sync_tree
+from template import TemplateLoader
+
+RELOAD_PATH = "/__livereload"
+RELOAD_SCRIPT = ('<script>new EventSource("' + RELOAD_PATH + '")'
+                 '.onmessage = function () { location.reload(); };</script>')
+POLL_INTERVAL = 0.2
+
+logger = logging.getLogger(__name__)
+
+
+def inject_reload_script(html):
+    index = html.rfind("</body>")
+    if index == -1:
+        return html + RELOAD_SCRIPT
+    return html[:index] + RELOAD_SCRIPT + html[index:]
+
+
+def snapshot(paths, ignore=DEFAULT_IGNORE):
+
+    """Map every file under the given files/directories to its mtime, skipping ignored files"""
+
+    mtimes = {}
+    for path in paths:
+        if os.path.isfile(path):
+            mtimes[path] = os.stat(path).st_mtime_ns
+        elif os.path.isdir(path):
+            for entry in scan_tree(path, ignore):
+                mtimes[entry.path] = entry.stat.st_mtime_ns
+    return mtimes
+
+
+def diff_snapshots(old, new):
+
+    """Return (changed, removed) paths between two snapshots"""
+
+    changed = {path for path, mtime in new.items() if old.get(path) != mtime}
+    removed = set(old) - set(new)
+    return changed, removed
+
+
+class ReloadNotifier():
+
+    """Version counter that live-reload connections block on"""
+
+    def __init__(self):
+        self.version = 0
+        self.condition = threading.Condition()
+
+    def notify(self):
+        with self.condition:
+            self.version += 1
+            self.condition.notify_all()
+
+    def wait(self, version, timeout=None):
+        with self.condition:
+            self.condition.wait_for(lambda: self.version != version, timeout)
+            return self.version
+
+
+class SiteWatcher():
+
+    """
+    Polls content, static assets, templates and partials, and rebuilds only
+    what a change affects: single pages through render_page, static files
+    through sync_tree, and the pages the manifest records as depending on a
+    changed template or partial. Files matching the ignore patterns are
+    not watched, so they are never published. With minify, pages and
+    static CSS are minified as in the full build. With an
+    assets.AssetManifest, changed assets are fingerprinted again and pages
+    reference the fingerprinted urls.
+    """
+
+    def __init__(self, content_dir, static_dir, template_path, dest_dir, basepath,
+                 manifest, static_record_path=None, ignore=DEFAULT_IGNORE, minify=False, asset_manifest=None):
+        self.content_dir = content_dir
+        self.static_dir = static_dir
+        self.template_path = template_path
+        self.dest_dir = dest_dir
+        self.basepath = basepath
+        self.manifest = manifest
+        self.static_record_path = static_record_path
+        self.ignore = ignore
+        self.minify = minify
+        self.asset_manifest = asset_manifest
+        self.assets = asset_manifest.urls() if asset_manifest is not None else None
+        self.templates = self.load_templates()
+        self.mtimes = snapshot(self.paths(), ignore)
+
+    def load_templates(self):
+        return TemplateLoader(self.template_path, self.content_dir, self.basepath, assets=self.assets)
+
+    def paths(self):
+        return [self.content_dir, self.static_dir, self.template_path, self.templates.partials_dir]
+
+    def poll(self):
+
+        """Rebuild whatever changed since the last poll; returns True if anything did"""
+
+        mtimes = snapshot(self.paths(), self.ignore)
+        changed, removed = diff_snapshots(self.mtimes, mtimes)
+        self.mtimes = mtimes
+        if not changed and not removed:
+            return False
+        self.apply(changed, removed)
+        return True
+
+    def apply(self, changed, removed):
+        rebuilt = set()
+        template_changes = {os.path.normpath(path) for path in changed | removed
+                            if self.templates.is_template(path)}
+        assets_changed = False
+        if any(self.in_dir(path, self.static_dir) for path in changed | removed):
+            sync_tree(self.static_dir, self.dest_dir, self.static_record_path,
+                      transforms=static_transforms(self.minify), ignore=self.ignore)
+            if self.asset_manifest is not None:
+                self.asset_manifest.update(self.static_dir, self.dest_dir, ignore=self.ignore)
+                assets = self.asset_manifest.urls()
+                assets_changed = assets != self.assets
+                self.assets = assets
+
+        if template_changes or assets_changed:
+            self.templates = self.load_templates()
+            if assets_changed or template_changes - self.manifest.dependencies():
+                # New asset urls change every template's digest, and a template
+                # no page used yet (e.g. a new per-directory one) may change
+                # which template pages use, so check them all
+                generate_pages_recursive(self.content_dir, self.template_path, self.dest_dir, self.basepath,
+                                         self.manifest, minify=self.minify, assets=self.assets, ignore=self.ignore)
+                rebuilt = set(self.manifest.entries)
+            else:
+                rebuilt = set(self.manifest.dependents(template_changes))
+                for source in sorted(rebuilt - removed):
+                    self.build_page(source)
+
+        for source in sorted(changed - rebuilt):
+            if self.in_dir(source, self.content_dir) and is_markdown(source):
+                self.build_page(source)
+
+        for source in sorted(removed):
+            if source in self.manifest.entries:
+                logger.debug(f"Removed stale page {self.manifest.remove(source)}")
+
+        self.manifest.save()
+
+    def build_page(self, source):
+        dest = page_dest_path(source, self.content_dir, self.dest_dir)
+        template = self.templates.template_for(source)
+        logger.debug(f"Generating page from {source} to {dest} using {template.path}")
+        render_page(source, dest, template, minify=self.minify)
+        self.manifest.record(source, hash_file(source), output_key(template, self.minify), self.basepath, dest,
+                             template.dependencies)
+
+    @staticmethod
+    def in_dir(path, directory):
+        return os.path.commonpath([os.path.abspath(path), os.path.abspath(directory)]) == os.path.abspath(directory)
+
+
+class LiveReloadHandler(SimpleHTTPRequestHandler):
+
+    """Static file handler that injects the reload script into HTML pages"""
+
+    def __init__(self, *args, notifier=None, **kwargs):
+        self.notifier = notifier
+        super().__init__(*args, **kwargs)
+
+    def do_GET(self):
+        if self.path == RELOAD_PATH:
+            return self.send_events()
+
+        path = self.translate_path(self.path)
+        if os.path.isdir(path) and self.path.endswith("/"):
+            path = os.path.join(path, "index.html")
+        if path.endswith(".html") and os.path.isfile(path):
+            return self.send_page(path)
+        return super().do_GET()
+
+    def send_page(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            body = inject_reload_script(f.read()).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_events(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+
+        version = self.notifier.version
+        try:
+            while True:
+                current = self.notifier.wait(version, timeout=15)
+                if current != version:
+                    self.wfile.write(b"data: reload\n\n")
+                    version = current
+                else:
+                    # Keep-alive comment so dead connections are noticed
+                    self.wfile.write(b": ping\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+def serve(directory, watcher, port=8888, poll_interval=POLL_INTERVAL):
+
+    """Serve directory with live reload while polling the watcher for changes"""
+
+    notifier = ReloadNotifier()
+    handler = partial(LiveReloadHandler, directory=directory, notifier=notifier)
+    server = ThreadingHTTPServer(("", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger.info(f"Serving {directory} on http://localhost:{port}/ (watching for changes)")
+
+    try:
+        while True:
+            time.sleep(poll_interval)
+            try:
+                start = perf_counter()
+                if watcher.poll():
+                    notifier.notify()
+                    logger.info(f"Rebuilt in {(perf_counter() - start) * 1000:.0f}ms")
+            except Exception as exc:
+                # Keep serving through broken edits; the next save retries
+                logger.error(f"Rebuild failed: {exc}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
@@ -0,0 +1,63 @@
+import os
+from collections import namedtuple
+from fnmatch import fnmatch
+
+# Editor backup and swap files, never worth publishing
+DEFAULT_IGNORE = ("*~", ".#*", "*.swp", ".DS_Store")
+
+FileEntry = namedtuple("FileEntry", ["path", "relative", "stat"])
+
+
+def is_ignored(name, relative, patterns):
+
+    """True if a file or directory name, or its '/'-separated relative path, matches a pattern"""
+
+    relative = relative.replace(os.sep, "/")
+    return any(fnmatch(name, pattern) or fnmatch(relative, pattern) for pattern in patterns)
+
+
+def _sorted_entries(path):
+    with os.scandir(path) as entries:
+        return sorted(entries, key=lambda entry: entry.name)
+
+
+def _subdirectory_entries(path):
+
+    """Like _sorted_entries, but a directory removed mid-scan is treated as empty"""
+
+    try:
+        return _sorted_entries(path)
+    except FileNotFoundError:
+        return []
+
+
+def scan_tree(root, ignore=DEFAULT_IGNORE):
+
+    """
+    Yield a FileEntry for every file under root, depth first in name order,
+    using os.scandir and an explicit stack instead of recursion. Ignored
+    directories are not descended into. The stat result comes from the
+    scandir entry, so callers can compare sizes and mtimes without another
+    system call per file. Entries removed while the scan is running are
+    skipped.
+    """
+
+    stack = [("", iter(_sorted_entries(root)))]
+    while stack:
+        prefix, entries = stack[-1]
+        entry = next(entries, None)
+        if entry is None:
+            stack.pop()
+            continue
+
+        relative = os.path.join(prefix, entry.name)
+        if ignore and is_ignored(entry.name, relative, ignore):
+            continue
+        if entry.is_dir():
+            stack.append((relative, iter(_subdirectory_entries(entry.path))))
+        elif entry.is_file():
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            yield FileEntry(entry.path, relative, stat)
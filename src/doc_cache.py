@@ -0,0 +1,120 @@
+import hashlib
+import os
+import pickle
+import uuid
+
+import htmlnode
+import inline_markdown
+import markdown_to_blocks
+import textnode
+
+# Bump when the cached format changes in a way the module sources don't show
+CACHE_FORMAT = 1
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+_parser_version = None
+
+
+def parser_version():
+
+    """
+    Hash of the parser's source code, so cached documents are invalidated
+    automatically whenever the markdown parser or node classes change.
+    """
+
+    global _parser_version
+    if _parser_version is None:
+        digest = hashlib.sha256(f"format {CACHE_FORMAT}".encode())
+        for module in (textnode, htmlnode, inline_markdown, markdown_to_blocks):
+            with open(module.__file__, "rb") as f:
+                digest.update(f.read())
+        _parser_version = digest.hexdigest()[:16]
+    return _parser_version
+
+
+class DocumentCache():
+
+    """
+    On-disk cache of parsed markdown_to_blocks.Document objects keyed by the
+    source's content hash, the parser version and variant, a string naming
+    everything else the parsed tree depends on (basepath, asset map). Entries are written
+    atomically, so parallel workers can share the cache, and the least
+    recently used entries are evicted by prune() once it exceeds max_bytes.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES, version=None, variant=""):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.version = version or parser_version()
+        self.variant = variant
+
+    def path_for(self, source_hash):
+        key = hashlib.sha256(f"{self.version}:{self.variant}:{source_hash}".encode()).hexdigest()
+        return os.path.join(self.directory, key[:2], key + ".pickle")
+
+    def get(self, source_hash):
+        path = self.path_for(source_hash)
+        try:
+            with open(path, "rb") as f:
+                document = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except (pickle.UnpicklingError, EOFError, AttributeError, ValueError):
+            # A corrupt entry is just a miss; drop it so it gets rewritten
+            self.discard(path)
+            return None
+
+        try:
+            # The mtime doubles as the last-used time for LRU eviction
+            os.utime(path)
+        except FileNotFoundError:
+            pass
+        return document
+
+    def put(self, source_hash, document):
+        path = self.path_for(source_hash)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(document, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    def discard(self, path):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+    def entries(self):
+
+        """Return (mtime, size, path) for every cache entry"""
+
+        found = []
+        if not os.path.isdir(self.directory):
+            return found
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".pickle"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                found.append((stat.st_mtime_ns, stat.st_size, path))
+        return found
+
+    def prune(self):
+
+        """Evict least recently used entries until the cache fits in max_bytes"""
+
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            self.discard(path)
+            total -= size
+            removed += 1
+        return removed
@@ -1,28 +1,74 @@
 from textnode import TextNode, TextType
 
+class _EmptyProps(dict):
+
+    """Read-only empty dict shared by every node created without props"""
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("EMPTY_PROPS is read-only, pass a dict of props instead")
+
+    __setitem__ = __delitem__ = clear = pop = popitem = setdefault = update = __ior__ = _read_only
+
+    def __reduce__(self):
+        return "EMPTY_PROPS"
+
+EMPTY_PROPS = _EmptyProps()
+
 class HTMLNode():
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag = None, value = None, children = None, props = None):
         self.tag = tag
         self.value = value
         self.children = children
-        self.props = props
+        self.props = EMPTY_PROPS if props is None else props
 
     def to_html(self):
         raise NotImplementedError("Please Override")
+
+    def iter_html(self):
+
+        """
+        Yield the HTML of this node as a sequence of string chunks.
+        The tree is walked with an explicit stack, so deep documents do not
+        hit the recursion limit and no per-level strings are built.
+        """
+
+        stack = [self]
+        while stack:
+            node = stack.pop()
+            if isinstance(node, str):
+                yield node
+            elif isinstance(node, ParentNode):
+                node.check_renderable()
+                yield f'<{node.tag}{node.props_to_html()}>'
+                stack.append(f'</{node.tag}>')
+                stack.extend(reversed(node.children))
+            else:
+                yield node.to_html()
+
+    def render_to(self, stream):
+
+        """Write the HTML of this node into a file-like object"""
+
+        for chunk in self.iter_html():
+            stream.write(chunk)
     
     def props_to_html(self):
-        if isinstance(self.props, dict):
-            ans = ""
-            for key, value in self.props.items():
-                ans += f' {key}=\"{value}\"'
-
-            return ans
-        elif self.props is None:
+        props = self.props
+        if props is EMPTY_PROPS or props is None:
             return ""
-        raise ValueError(f"Excepting Dict type received {type(self.props)}")
+        if isinstance(props, dict):
+            return "".join(f' {key}="{value}"' for key, value in props.items())
+        raise ValueError(f"Excepting Dict type received {type(props)}")
+
+    def repr_props(self):
+        return None if self.props is EMPTY_PROPS else self.props
     
     def __repr__(self):
-        return f"HTMLNode({self.tag}, {self.value}, {self.children}, {self.props})"
+        return f"HTMLNode({self.tag}, {self.value}, {self.children}, {self.repr_props()})"
     
     def __eq__(self, other):
         return (self.children == other.children and self.props == other.props
@@ -30,6 +76,8 @@ class HTMLNode():
     
 
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, value, props=None):
         super().__init__(tag, value, None, props)
 
@@ -44,23 +92,41 @@ class LeafNode(HTMLNode):
             return f'<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>'
     
     def __repr__(self):
-        return f"LeafNode({self.tag}, {self.value}, {self.props})"
+        return f"LeafNode({self.tag}, {self.value}, {self.repr_props()})"
             
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None):
         super().__init__(tag, None, children, props)
 
-    def to_html(self):
+    def check_renderable(self):
         if self.tag is None:
             raise ValueError("Tag is Mandatory")
         
         if self.children is None:
             raise ValueError("ParentNode should contain atleast 1 children node.")
-        
-        return f'<{self.tag}{self.props_to_html()}>{"".join([child_tag.to_html() for child_tag in self.children])}</{self.tag}>'
 
-def text_node_to_html_node(text_node):
+    def to_html(self):
+        return "".join(self.iter_html())
+
+def resolve_url(url, basepath="/", assets=None):
+
+    """
+    Prefix a root-relative url with the site basepath, after swapping it
+    for its fingerprinted name when assets (url -> url) has one.
+    """
+
+    if not url or not url.startswith("/") or url.startswith("//"):
+        return url
+    if assets:
+        url = assets.get(url, url)
+    if basepath == "/":
+        return url
+    return basepath + url[1:]
+
+def text_node_to_html_node(text_node, basepath="/", assets=None):
     if isinstance(text_node, TextNode):
         if text_node.text_type == TextType.TEXT:
             return LeafNode(None, text_node.text)
@@ -71,9 +137,9 @@ def text_node_to_html_node(text_node):
         elif text_node.text_type == TextType.CODE:
             return LeafNode("code", text_node.text)
         elif text_node.text_type == TextType.LINK:
-            return LeafNode("a", text_node.text, {"href":text_node.url})
+            return LeafNode("a", text_node.text, {"href": resolve_url(text_node.url, basepath, assets)})
         elif text_node.text_type == TextType.IMAGE:
-            return LeafNode("img", "", {"src":text_node.url, "alt": text_node.text})
+            return LeafNode("img", "", {"src": resolve_url(text_node.url, basepath, assets), "alt": text_node.text})
         else:
             raise ValueError(f"Unhandled TextType: {text_node.text_type}")
     else:
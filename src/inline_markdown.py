@@ -1,6 +1,11 @@
 from textnode import TextNode, TextType
 import re
 
+INLINE_TOKEN = re.compile(r"\*\*|[_`]|!?\[")
+IMAGE_PATTERN = re.compile(r"!\[(.*?)\]\((.*?)\)")
+LINK_PATTERN = re.compile(r"(?<!!)\[(.*?)\]\((.*?)\)")
+DELIMITERS = {"**": TextType.BOLD, "_": TextType.ITALIC, "`": TextType.CODE}
+
 def split_nodes_delimiter(old_nodes, delimiter, text_type):
     new_nodes = []
     for old_node in old_nodes:
@@ -24,63 +29,109 @@ def split_nodes_delimiter(old_nodes, delimiter, text_type):
 
 
 def extract_markdown_images(text):
-    image_node_contents = re.findall(r"!\[(.*?)\]\((.*?)\)", text)
-    return image_node_contents
+    return IMAGE_PATTERN.findall(text)
 
 def extract_markdown_links(text):
-    link_node_contents = re.findall(r"(?<!!)\[(.*?)\]\((.*?)\)", text)
-    return link_node_contents
+    return LINK_PATTERN.findall(text)
 
 
-def split_nodes_image(old_nodes):
+def split_nodes_pattern(old_nodes, pattern, to_node):
+
+    """
+    Split every TEXT node around the matches of pattern in a single finditer
+    pass, slicing at match positions instead of searching for each match
+    again. to_node turns a match into the node that replaces it.
+    """
+
     new_nodes = []
 
     for node in old_nodes:
-        if node.text_type == TextType.TEXT:
-            temp = node.text
-            image_nodes = extract_markdown_images(temp)
-            for image_node in image_nodes:
-                parted = temp.partition(f"![{image_node[0]}]({image_node[1]})")
-                if parted[0]:  # Only add non-empty text before image
-                    new_nodes.append(TextNode(parted[0], TextType.TEXT))
-                new_nodes.append(TextNode(image_node[0], TextType.IMAGE, image_node[1]))
-                temp = parted[2]  # Store remaining text for next iteration
-            if temp:  # Only append remaining text if not empty
-                new_nodes.append(TextNode(temp, TextType.TEXT))
-        else:
+        if node.text_type != TextType.TEXT:
             new_nodes.append(node)
-            
+            continue
+        text = node.text
+        position = 0
+        for match in pattern.finditer(text):
+            if match.start() > position:  # Only add non-empty text before the match
+                new_nodes.append(TextNode(text[position:match.start()], TextType.TEXT))
+            new_nodes.append(to_node(match))
+            position = match.end()
+        if position < len(text):
+            new_nodes.append(TextNode(text[position:], TextType.TEXT))
+
     return new_nodes
 
+def split_nodes_image(old_nodes):
+    return split_nodes_pattern(old_nodes, IMAGE_PATTERN,
+                               lambda match: TextNode(match.group(1), TextType.IMAGE, match.group(2)))
+
 def split_nodes_link(old_nodes):
-    new_nodes = []
+    return split_nodes_pattern(old_nodes, LINK_PATTERN,
+                               lambda match: TextNode(match.group(1), TextType.LINK, match.group(2)))
 
-    for node in old_nodes:
-        if node.text_type == TextType.TEXT:
-            temp = node.text
-            link_nodes = extract_markdown_links(temp)
-            for link_node in link_nodes:
-                parted = temp.partition(f"[{link_node[0]}]({link_node[1]})")
-                if parted[0]:  # Only add non-empty text before link
-                    new_nodes.append(TextNode(parted[0], TextType.TEXT))
-                new_nodes.append(TextNode(link_node[0], TextType.LINK, link_node[1]))
-                temp = parted[2]  # Store remaining text for next iteration
-            if temp:  # Only append remaining text if not empty
-                new_nodes.append(TextNode(temp, TextType.TEXT))
-        else:
-            new_nodes.append(node)
-            
-    return new_nodes
+def contains_image(text, start, end):
+
+    """True if an image starts between start and end; images take precedence over links"""
+
+    position = text.find("![", start, end)
+    while position != -1:
+        if IMAGE_PATTERN.match(text, position):
+            return True
+        position = text.find("![", position + 1, end)
+    return False
 
 def text_to_textnodes(text):
+
+    """
+    Tokenize inline markdown in a single left-to-right scan.
+    Bold, italic and code spans are taken literally up to their closing
+    delimiter; images and links are matched where they start.
+    """
+
     if not isinstance(text, TextNode):
         text = TextNode(text, TextType.TEXT)
-    nodes = split_nodes_delimiter([text], "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
+    if text.text_type != TextType.TEXT:
+        return [text]
 
-    return nodes
+    text = text.text
+    nodes = []
+    start = 0   # start of the pending plain text run
+    position = 0
+
+    while True:
+        token = INLINE_TOKEN.search(text, position)
+        if token is None:
+            break
+        delimiter = token.group()
+
+        if delimiter in DELIMITERS:
+            close = text.find(delimiter, token.end())
+            if close == -1:
+                raise ValueError("invalid markdown, formatted section not closed")
+            if token.start() > start:
+                nodes.append(TextNode(text[start:token.start()], TextType.TEXT))
+            if close > token.end():
+                nodes.append(TextNode(text[token.end():close], DELIMITERS[delimiter]))
+            position = start = close + len(delimiter)
+            continue
+
+        if delimiter == "![":
+            match = IMAGE_PATTERN.match(text, token.start())
+            text_type = TextType.IMAGE
+        else:
+            match = LINK_PATTERN.match(text, token.start())
+            text_type = TextType.LINK
 
+        if match is None or (text_type == TextType.LINK and contains_image(text, token.end(), match.end())):
+            position = token.start() + 1
+            continue
 
+        if token.start() > start:
+            nodes.append(TextNode(text[start:token.start()], TextType.TEXT))
+        nodes.append(TextNode(match.group(1), text_type, match.group(2)))
+        position = start = match.end()
+
+    if start < len(text):
+        nodes.append(TextNode(text[start:], TextType.TEXT))
+
+    return nodes
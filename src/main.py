@@ -1,113 +1,544 @@
 import os
 import shutil
-from markdown_to_blocks import markdown_to_html_node, extract_title
+import argparse
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from time import perf_counter
+from markdown_to_blocks import parse_document
+from manifest import BuildManifest, hash_file
+from template import PageTemplate, TemplateLoader
+from static_sync import sync_tree
+from build_report import BuildReport, PageTimer
+from doc_cache import DocumentCache
+from assets import AssetManifest
+from discovery import DEFAULT_IGNORE, scan_tree
+from shards import merge_shards, parse_shard, select_shard, write_shard_manifest
+from block_memo import BlockMemo, DEFAULT_MAX_ENTRIES
+from pipeline import DEFAULT_DEPTH, PipelineError, run_pipeline
+from postprocess import minify_css, minify_html, precompress_tree, remove_compressed
+from search_index import SearchIndex
+from site_index import SiteIndex
 import sys
 
-def main():
+MANIFEST_PATH = os.path.join(".cache", "manifest.json")
+STATIC_RECORD_PATH = os.path.join(".cache", "static.json")
+REPORT_PATH = os.path.join(".cache", "build-report.json")
+DOCUMENT_CACHE_DIR = os.path.join(".cache", "documents")
+ASSETS_PATH = os.path.join(".cache", "assets.json")
+SEARCH_STATE_PATH = os.path.join(".cache", "search.json")
+SEARCH_DIR = os.path.join("public", "search")
+SITE_INDEX_PATH = os.path.join(".cache", "pages.json")
+
+logger = logging.getLogger(__name__)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Generate the static site into ./public")
+    parser.add_argument("basepath", nargs="?", default=None,
+                        help="URL prefix for the site (defaults to $GITHUB_PAGES_BASEPATH or /)")
+    parser.add_argument("--clean", action="store_true",
+                        help="wipe ./public and the build manifest and rebuild every page")
+    parser.add_argument("--link-static", action="store_true",
+                        help="hard link static assets into ./public instead of copying them")
+    parser.add_argument("--watch", action="store_true",
+                        help="after building, serve ./public with live reload and rebuild on changes")
+    parser.add_argument("--port", type=int, default=8888,
+                        help="port for --watch (default: 8888)")
+    parser.add_argument("--log-level", default="info", choices=["debug", "info", "warning", "error"],
+                        help="debug lists every generated page and copied file (default: info)")
+    parser.add_argument("--report", default=REPORT_PATH,
+                        help=f"where to write the JSON build report (default: {REPORT_PATH})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="don't reuse parsed documents from .cache/documents")
+    parser.add_argument("--cache-size", type=int, default=256,
+                        help="size cap of the parsed document cache in MB (default: 256)")
+    parser.add_argument("--block-memo", type=int, default=DEFAULT_MAX_ENTRIES,
+                        help=f"rendered blocks memoised per process, 0 disables (default: {DEFAULT_MAX_ENTRIES})")
+    parser.add_argument("--minify", action="store_true",
+                        help="minify generated pages and static CSS (<pre> and <script> contents are kept)")
+    parser.add_argument("--precompress", action="store_true",
+                        help="write .gz (and .br with the brotli package) siblings of text outputs")
+    parser.add_argument("--fingerprint", action="store_true",
+                        help="also publish static assets under content-hashed names and reference those")
+    parser.add_argument("--shard", type=shard_argument, metavar="I/N",
+                        help="build only the I-th of N deterministic partitions of the pages")
+    parser.add_argument("--merge", nargs="+", metavar="SHARD_DIR",
+                        help="combine the outputs of --shard builds into public/ instead of building")
+    parser.add_argument("--search", action="store_true",
+                        help=f"build a full-text search index and client into {SEARCH_DIR}")
+    parser.add_argument("--site-url", metavar="URL",
+                        help="write sitemap.xml and an Atom feed (atom.xml) with absolute urls under URL")
+    parser.add_argument("--feed-author", metavar="NAME",
+                        help="author of the Atom feed (default: the home page title)")
+    parser.add_argument("--ignore", action="append", default=[], metavar="PATTERN",
+                        help="skip content and static files or directories matching this glob (repeatable)")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                        help="number of processes rendering pages (default: CPU count, 1 disables the pool)")
+    args = parser.parse_args(argv)
+    if args.search and args.shard:
+        parser.error("--search can't be combined with --shard: each shard would write a partial index")
+    if args.site_url and args.shard:
+        parser.error("--site-url can't be combined with --shard: each shard would write a partial sitemap")
+    return args
+
+def shard_argument(text):
+    try:
+        return parse_shard(text)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc))
+
+def main(argv=None):
 
-    basepath = os.environ.get("GITHUB_PAGES_BASEPATH", "/")
+    args = parse_args(argv)
+    basepath = args.basepath or os.environ.get("GITHUB_PAGES_BASEPATH", "/")
 
     if not basepath.endswith("/"):
         basepath += "/"
 
-    staticToPublic()
-    generate_pages_recursive('content', 'template.html', 'public', basepath)
-
-def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath):
-
-
-    entries = os.listdir(dir_path_content)
-
-    for entry in entries:
-
-        item = os.path.join(dir_path_content, entry)
-        dest_item = os.path.join(dest_dir_path, entry)
-
-        if os.path.isfile(item):
-
-            if entry.lower().endswith('.md') or entry.lower().endswith('.markdown'):
-
-                dest_html = os.path.splitext(dest_item)[0] + '.html'
-                generate_page(item, template_path, dest_html, basepath)
-
-        elif os.path.isdir(item):
-            generate_pages_recursive(item, template_path, dest_item, basepath)
-
-def generate_page(from_path, template_path, dest_path, basepath):
-
-    print(f"Generating page from {from_path} to {dest_path} using {template_path}")
-
-    with open(from_path, "r", encoding="utf-8") as f:
-        markdown_content = f.read()
-
-    with open(template_path, "r", encoding="utf-8") as f:
-        template_content = f.read()
-
-    
-    html_node = markdown_to_html_node(markdown_content)
-    html_content = html_node.to_html()
-
-    title = extract_title(markdown_content) or ""
-
-    page_content = template_content.replace("{{ Title }}", title).replace("{{ Content }}", html_content)
-    page_content = page_content.replace('href="/', f'href="{basepath}').replace('src="/', f'src="{basepath}')
-
-    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-
-    with open(dest_path, "w", encoding="utf-8") as f:
-        f.write(page_content)
-
-
-def staticToPublic():
+    logging.basicConfig(level=args.log_level.upper(), format="%(message)s")
+
+    if args.merge:
+        try:
+            merged = merge_shards(args.merge, 'public')
+        except ValueError as exc:
+            raise SystemExit(f"error: {exc}") from None
+        logger.info(f"Merged {merged} files from {len(args.merge)} shards into public")
+        return
+
+    if args.clean and os.path.exists(MANIFEST_PATH):
+        os.remove(MANIFEST_PATH)
+
+    ignore = DEFAULT_IGNORE + tuple(args.ignore)
+    report = BuildReport()
+    staticToPublic(clean=args.clean, link=args.link_static, report=report, minify=args.minify, ignore=ignore)
+
+    assets = asset_manifest = None
+    if args.fingerprint:
+        asset_manifest = AssetManifest(ASSETS_PATH)
+        written, removed = asset_manifest.update('./static', './public', args.link_static, ignore)
+        for item in written:
+            logger.debug(f"Fingerprinted {item}")
+        for item in removed:
+            logger.debug(f"Removed old asset version {item}")
+        assets = asset_manifest.urls()
+
+    variant = basepath if assets is None else f"{basepath}:{asset_manifest.digest()}"
+    cache = None if args.no_cache else DocumentCache(DOCUMENT_CACHE_DIR, args.cache_size * 1024 * 1024,
+                                                     variant=variant)
+
+    manifest = BuildManifest(MANIFEST_PATH)
+    search = SearchIndex(SEARCH_STATE_PATH, SEARCH_DIR) if args.search else None
+    site_index = (SiteIndex(SITE_INDEX_PATH, 'public', args.site_url, basepath, args.feed_author)
+                  if args.site_url else None)
+    try:
+        generate_pages_recursive('content', 'template.html', 'public', basepath, manifest, workers=args.workers,
+                                 report=report, cache=cache, memo_entries=args.block_memo, minify=args.minify,
+                                 assets=assets, shard=args.shard, ignore=ignore, search=search,
+                                 site_index=site_index)
+        for output in manifest.remove_stale():
+            logger.debug(f"Removed stale page {output}")
+            report.removed += 1
+    finally:
+        manifest.save()
+
+    if search is not None:
+        start = perf_counter()
+        written = search.write()
+        report.counters["search_shards_written"] = len(written)
+        logger.info(f"Search index: {len(search.pages)} pages, {len(written)} shards rewritten "
+                    f"in {perf_counter() - start:.2f}s")
+
+    if site_index is not None:
+        for item in site_index.write():
+            logger.debug(f"Wrote {item}")
+
+    if args.precompress:
+        compressed, _ = precompress_tree('public', args.workers, './static')
+        report.counters["precompressed"] = len(compressed)
+
+    if args.shard:
+        write_shard_manifest('public', 'content', discover_pages('content', 'public', ignore), args.shard)
+
+    if cache is not None:
+        cache.prune()
+
+    report.finish()
+    report.write(args.report)
+    log_report(report)
+
+    if args.watch:
+        from dev_server import SiteWatcher, serve
+
+        watcher = SiteWatcher('content', './static', 'template.html', 'public', basepath,
+                              manifest, STATIC_RECORD_PATH, ignore, args.minify,
+                              asset_manifest)
+        serve('public', watcher, args.port)
+
+def log_report(report):
+    totals = report.totals()
+    logger.info(f"Built {len(report.pages)} pages ({report.skipped} unchanged, {report.removed} removed) "
+                f"and copied {report.static['copied']} static files in {report.seconds:.2f}s")
+    if report.pages:
+        logger.info("Page time by phase: " + ", ".join(f"{phase} {seconds:.3f}s" for phase, seconds in totals.items()))
+        for page in report.slowest(3):
+            logger.info(f"  slow: {page['source']} {page['seconds'] * 1000:.1f}ms")
+    if "memo_hits" in report.counters:
+        logger.info(f"Block memo: {report.counters['memo_hits']} hits, {report.counters['memo_misses']} misses")
+    if "precompressed" in report.counters:
+        logger.info(f"Precompressed {report.counters['precompressed']} changed files")
+
+def is_markdown(path):
+    return path.lower().endswith(('.md', '.markdown'))
+
+def page_dest_path(source, dir_path_content, dest_dir_path):
+    relative = os.path.relpath(source, dir_path_content)
+    return os.path.splitext(os.path.join(dest_dir_path, relative))[0] + '.html'
+
+def iter_pages(dir_path_content, dest_dir_path, ignore=DEFAULT_IGNORE):
+
+    """Lazily yield (FileEntry, dest) for every markdown file, in a stable sorted order"""
+
+    for entry in scan_tree(dir_path_content, ignore):
+        if is_markdown(entry.relative):
+            yield entry, os.path.splitext(os.path.join(dest_dir_path, entry.relative))[0] + '.html'
+
+def discover_pages(dir_path_content, dest_dir_path, ignore=DEFAULT_IGNORE):
+
+    """Return (source, dest) pairs for every markdown file, in a stable sorted order"""
+
+    return [(entry.path, dest) for entry, dest in iter_pages(dir_path_content, dest_dir_path, ignore)]
+
+def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath, manifest=None, *, workers=1,
+                             report=None, cache=None, memo_entries=0, minify=False, assets=None, shard=None,
+                             ignore=DEFAULT_IGNORE, search=None, site_index=None):
+
+    """
+    Render every markdown file under dir_path_content into dest_dir_path
+    with its nearest template, skipping pages the manifest records as
+    current. The keyword-only options tune how pages are rendered
+    (workers, cache, memo_entries, minify, assets), which are built
+    (shard, ignore) and what is collected along the way (report, search,
+    site_index); see the matching command line flags.
+    """
+
+    stats = {}
+    pages = []
+    for entry, dest in iter_pages(dir_path_content, dest_dir_path, ignore):
+        stats[entry.path] = entry.stat
+        pages.append((entry.path, dest))
+    if shard is not None:
+        pages = select_shard(pages, dir_path_content, shard)
+    loader = TemplateLoader(template_path, dir_path_content, basepath, assets=assets)
+
+    pending = []
+    for source, dest in pages:
+        template = loader.template_for(source)
+        source_hash = None
+        if manifest is not None:
+            source_hash = manifest.source_hash(source, stats[source])
+            if (not manifest.needs_build(source, source_hash, output_key(template, minify), basepath, dest)
+                    and not any(index.needs_update(source, source_hash)
+                                for index in (search, site_index) if index is not None)):
+                continue
+        pending.append((source, dest, source_hash, template.path))
+
+    collect_terms = search is not None
+    if workers > 1 and len(pending) > 1:
+        built = generate_pages_parallel(pending, loader.templates, workers, cache, memo_entries, minify,
+                                        collect_terms)
+    else:
+        memo = BlockMemo(memo_entries) if memo_entries > 0 else None
+        built = generate_pages_serial(pending, loader.templates, cache, memo, minify, collect_terms)
+
+    for (source, dest, source_hash, template_path), job in zip(pending, built):
+        if manifest is not None:
+            template = loader.templates[template_path]
+            manifest.record(source, source_hash, output_key(template, minify), basepath, dest,
+                            template.dependencies)
+        if report is not None:
+            report.add_page(source, job.timer.phases, job.timer.counters)
+        url = basepath + os.path.relpath(dest, dest_dir_path).replace(os.sep, "/")
+        # Pages rebuilt for a template change keep their index entries
+        if search is not None and search.needs_update(source, source_hash, url):
+            search.update_page(source, source_hash, url, job.title, job.terms)
+        if site_index is not None and site_index.needs_update(source, source_hash, url):
+            site_index.update_page(source, source_hash, url, job.title, stats[source].st_mtime)
+
+    for index in (search, site_index):
+        if index is not None:
+            index.retain(source for source, _ in pages)
+    if report is not None:
+        report.skipped += len(pages) - len(pending)
+
+def output_key(template, minify=False):
+
+    """The manifest's template hash, which also covers output options like minify"""
+
+    return template.digest + ":minify" if minify else template.digest
+
+class PageJob():
+
+    """A page moving through the read -> render -> write stages"""
+
+    __slots__ = ("source", "dest", "source_hash", "template", "text", "document", "parsed", "html", "stream",
+                 "timer", "title", "terms")
+
+    def __init__(self, source, dest, source_hash=None, template=None):
+        self.source = source
+        self.dest = dest
+        self.source_hash = source_hash
+        self.template = template
+        self.text = None
+        self.document = None
+        self.parsed = False
+        self.html = None
+        self.stream = None
+        self.timer = PageTimer()
+        self.title = None
+        self.terms = None
+
+    def __repr__(self):
+        return f"PageJob({self.source}, {self.dest})"
+
+def run_page_pipeline(pages, render, write, cache=None, depth=DEFAULT_DEPTH):
+
+    """
+    Feed (source, dest, source_hash, template_path) tuples through
+    run_pipeline, reading ahead and writing behind the render stage, and
+    yield the finished PageJobs in order. A failure is re-raised naming the
+    source file.
+    """
+
+    jobs = (PageJob(*page) for page in pages)
+    try:
+        for job in run_pipeline(jobs, partial(read_page, cache=cache), render, write, depth):
+            logger.debug(f"Generating page from {job.source} to {job.dest} using {job.template}")
+            yield job
+    except PipelineError as exc:
+        raise RuntimeError(f"Failed to generate page from {exc.item.source}: {exc.__cause__}") from exc.__cause__
+
+def generate_pages_serial(pages, templates, cache=None, memo=None, minify=False, collect_terms=False):
+
+    """Render pages in this process; templates maps template paths to PageTemplates"""
+
+    def render(job):
+        return render_job(job, templates[job.template], memo, minify, collect_terms, stream=True)
+
+    write = partial(write_page, cache=cache)
+    return run_page_pipeline(pages, render, write, cache)
+
+_worker_templates = None
+_worker_cache = None
+_worker_memo = None
+_worker_minify = False
+_worker_collect_terms = False
+
+def _init_worker(templates, cache, memo_entries, minify=False, collect_terms=False):
+    global _worker_templates, _worker_cache, _worker_memo, _worker_minify, _worker_collect_terms
+    _worker_templates = templates
+    _worker_cache = cache
+    _worker_memo = BlockMemo(memo_entries) if memo_entries > 0 else None
+    _worker_minify = minify
+    _worker_collect_terms = collect_terms
+
+def _render_in_worker(job):
+    template = _worker_templates[job.template]
+    render_job(job, template, _worker_memo, _worker_minify, _worker_collect_terms)
+    # Store the document here rather than shipping it back to the writer
+    store_document(job, _worker_cache)
+    job.document = None
+    return job
+
+def pool_context():
+
+    """
+    Workers are started while the pipeline's reader and writer threads are
+    running, and forking a multi-threaded process can deadlock the child,
+    so they come from a forkserver (or are spawned where there is none).
+    """
+
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+def generate_pages_parallel(pages, templates, workers, cache=None, memo_entries=0, minify=False,
+                            collect_terms=False):
+
+    """
+    Render (source, dest, source_hash, template_path) tuples in a process
+    pool while sources are read and outputs written by the pipeline threads.
+    Each worker receives the compiled templates once and keeps its own block
+    memo. At most a few pages per worker are in flight at any time.
+    """
+
+    workers = min(workers, len(pages))
+    with ProcessPoolExecutor(max_workers=workers, mp_context=pool_context(), initializer=_init_worker,
+                             initargs=(templates, cache, memo_entries, minify, collect_terms)) as executor:
+        try:
+            render = partial(executor.submit, _render_in_worker)
+            write = partial(write_page, cache=cache)
+            yield from run_page_pipeline(pages, render, write, cache,
+                                         max(DEFAULT_DEPTH, 2 * workers))
+        finally:
+            executor.shutdown(cancel_futures=True)
+
+def generate_page(from_path, template_path, dest_path, basepath, template=None, cache=None, source_hash=None,
+                  memo=None):
+
+    logger.debug(f"Generating page from {from_path} to {dest_path} using {template_path}")
+
+    if template is None:
+        template = PageTemplate.load(template_path, basepath)
+    return render_page(from_path, dest_path, template, cache, source_hash, memo)
+
+def render_page(from_path, dest_path, template, cache=None, source_hash=None, memo=None, minify=False):
+
+    """
+    Render one page and return its PageTimer with the seconds spent in each
+    build phase. With a DocumentCache, a previously parsed document for the
+    same source hash and cache variant is reused and only the template and
+    write steps run. With a BlockMemo, blocks already rendered in this
+    process are reused. minify minifies the page.
+    """
+
+    job = PageJob(from_path, dest_path, source_hash, template.path)
+    read_page(job, cache)
+    render_job(job, template, memo, minify, stream=True)
+    write_page(job, cache)
+    return job.timer
+
+def read_page(job, cache=None):
+
+    """Read stage: fetch the page's cached document, or else its markdown"""
+
+    start = perf_counter()
+    if cache is not None:
+        if job.source_hash is None:
+            job.source_hash = hash_file(job.source)
+        job.document = cache.get(job.source_hash)
+
+    if job.document is None:
+        with open(job.source, "r", encoding="utf-8") as f:
+            job.text = f.read()
+    job.timer.add("read", perf_counter() - start)
+    return job
+
+def render_job(job, template, memo=None, minify=False, collect_terms=False, stream=False):
+
+    """
+    Render stage: parse the markdown if needed, fill in the template and
+    optionally minify. The page's title, and with collect_terms its search
+    terms, are kept on the job after the document is dropped.
+    With stream (and no minify), the HTML is not built here: job.stream is
+    set to write it chunk by chunk into the output in the write stage.
+    Pages rendered in worker processes are built as strings instead, which
+    are cheaper to send back than the document tree.
+    """
+
+    timer = job.timer
+    if job.document is None:
+        start = perf_counter()
+        inline_before = timer.phases["inline"]
+        hits, misses = (memo.hits, memo.misses) if memo is not None else (0, 0)
+        job.document = parse_document(job.text, timer, memo, template.basepath, template.assets)
+        job.text = None
+        job.parsed = True
+        if memo is not None:
+            timer.count("memo_hits", memo.hits - hits)
+            timer.count("memo_misses", memo.misses - misses)
+        timer.add("blocks", perf_counter() - start - (timer.phases["inline"] - inline_before))
+
+    job.title = job.document.title
+    if collect_terms:
+        job.terms = job.document.terms
+
+    # Urls were resolved against the basepath and assets when the nodes were created
+    if stream and not minify:
+        content = timer.timed_chunks("render", job.document.html_node.iter_html())
+        job.stream = partial(template.render_to, Title=job.document.title or "", Content=content)
+        return job
+
+    start = perf_counter()
+    content = job.document.html_node.to_html()
+    rendered = perf_counter()
+    timer.add("render", rendered - start)
+
+    job.html = template.render(Title=job.document.title or "", Content=content)
+    filled = perf_counter()
+    timer.add("template", filled - rendered)
+
+    if minify:
+        job.html = minify_html(job.html)
+        timer.add("minify", perf_counter() - filled)
+    return job
+
+def store_document(job, cache=None):
+    if cache is not None and job.parsed and job.document is not None:
+        cache.put(job.source_hash, job.document)
+
+def write_page(job, cache=None):
+
+    """
+    Write stage: write the rendered page, streaming it when the render stage
+    deferred it, drop its now stale precompressed siblings and cache a
+    freshly parsed document
+    """
+
+    if not isinstance(job, PageJob):
+        # A future from the process pool
+        job = job.result()
+
+    start = perf_counter()
+    rendering = job.timer.phases["render"]
+    os.makedirs(os.path.dirname(job.dest), exist_ok=True)
+    with open(job.dest, "w", encoding="utf-8") as f:
+        if job.stream is not None:
+            job.stream(f)
+        else:
+            f.write(job.html)
+    remove_compressed(job.dest)
+    store_document(job, cache)
+    job.html = job.stream = job.document = None
+    # Streamed chunks were timed as render
+    job.timer.add("write", perf_counter() - start - (job.timer.phases["render"] - rendering))
+    return job
+
+
+def static_transforms(minify=False):
+    return {".css": minify_css} if minify else None
+
+def staticToPublic(clean=True, link=False, report=None, minify=False, ignore=DEFAULT_IGNORE):
     destPath = "./public"
 
     if ( not os.path.exists(destPath) ):
         os.mkdir(destPath)
 
-    try:
-        print("Cleaning public dir")
-        shutil.rmtree(destPath)
-        os.mkdir(destPath)
-    except Exception:
-        raise OSError("Couldn't clear the dest folder")
+    if clean:
+        try:
+            logger.info("Cleaning public dir")
+            shutil.rmtree(destPath)
+            os.mkdir(destPath)
+        except Exception:
+            raise OSError("Couldn't clear the dest folder")
 
     sourcePath = "./static"
 
     if ( os.path.exists(sourcePath) ):
 
-        recurserCopy(sourcePath, destPath)
+        start = perf_counter()
+        copied, removed = sync_tree(sourcePath, destPath, STATIC_RECORD_PATH, link, static_transforms(minify),
+                                    ignore)
+        for item in copied:
+            logger.debug(f"Copied File {item}")
+        for item in removed:
+            logger.debug(f"Removed stale file {item}")
+
+        if report is not None:
+            report.set_static(len(copied), len(removed), perf_counter() - start)
 
     else:
         raise FileNotFoundError("Couldn't resovle the source path ", sourcePath)
 
 
-
-def recurserCopy(sourcePath, destPath):
-
-    entries = os.listdir(sourcePath)
-
-
-    for entry in entries:
-
-        item = os.path.join(sourcePath, entry)
-        if os.path.isfile(item):
-
-            shutil.copy2(item, destPath)
-
-            print(f"Copied File {item} to {destPath}")
-
-        elif os.path.isdir(item):
-
-            dirDestPath = os.path.join(destPath, entry)
-            if not os.path.exists(dirDestPath):
-                os.mkdir(dirDestPath)
-
-            print(f"Creating subDir {dirDestPath}")
-
-            recurserCopy(item, dirDestPath)
-
-    
-
-
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,155 @@
+import hashlib
+import json
+import os
+
+MANIFEST_VERSION = 2
+GENERATOR_DIR = os.path.dirname(os.path.abspath(__file__))
+
+_generator_version = None
+
+
+def hash_file(path):
+
+    """Return the sha256 hex digest of a file's contents"""
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def generator_version():
+
+    """
+    Hash of the generator's own source (every non-test module next to this
+    one), so a parser or renderer fix rebuilds every page
+    """
+
+    global _generator_version
+    if _generator_version is None:
+        digest = hashlib.sha256()
+        for name in sorted(os.listdir(GENERATOR_DIR)):
+            if name.endswith(".py") and not name.startswith("test"):
+                digest.update(name.encode("utf-8"))
+                with open(os.path.join(GENERATOR_DIR, name), "rb") as f:
+                    digest.update(f.read())
+        _generator_version = digest.hexdigest()[:16]
+    return _generator_version
+
+
+class BuildManifest():
+
+    """
+    Persistent record of what every generated page was built from.
+    Each entry maps a source path to its content hash, the template hash,
+    the basepath, the output path and the generator_version() it was built
+    with, so unchanged pages can be skipped.
+    It also lists the template files (template and partials) each page was
+    rendered with, so a change to one of them rebuilds just its dependents.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.seen = set()
+        self.stats = {}
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            # A corrupt manifest only costs us a full rebuild
+            return
+
+        if data.get("version") == MANIFEST_VERSION:
+            self.entries = data.get("pages", {})
+
+    def source_hash(self, source, stat=None):
+
+        """
+        Hash a source, reusing the recorded hash when its size and mtime are
+        unchanged, so a no-op build does not read every source file.
+        """
+
+        if stat is None:
+            stat = os.stat(source)
+        self.stats[source] = (stat.st_size, stat.st_mtime_ns)
+        entry = self.entries.get(source)
+        if entry is not None and [entry.get("size"), entry.get("mtime_ns")] == [stat.st_size, stat.st_mtime_ns]:
+            return entry["hash"]
+        return hash_file(source)
+
+    def needs_build(self, source, source_hash, template_hash, basepath, dest):
+        self.seen.add(source)
+        entry = self.entries.get(source)
+        if entry is None:
+            return True
+        return not (entry["hash"] == source_hash
+                    and entry["template_hash"] == template_hash
+                    and entry["basepath"] == basepath
+                    and entry["output"] == dest
+                    and entry.get("generator") == generator_version()
+                    and os.path.exists(dest))
+
+    def record(self, source, source_hash, template_hash, basepath, dest, dependencies=()):
+        self.seen.add(source)
+        previous = self.entries.get(source)
+        if previous is not None and previous["output"] != dest and os.path.exists(previous["output"]):
+            os.remove(previous["output"])
+
+        self.entries[source] = {
+            "hash": source_hash,
+            "template_hash": template_hash,
+            "basepath": basepath,
+            "output": dest,
+            "generator": generator_version(),
+            "dependencies": list(dependencies),
+        }
+        if source in self.stats:
+            self.entries[source]["size"], self.entries[source]["mtime_ns"] = self.stats.pop(source)
+
+    def dependents(self, paths):
+
+        """Return the sources rendered with any of the given template files"""
+
+        paths = set(paths)
+        return sorted(source for source, entry in self.entries.items()
+                      if paths.intersection(entry.get("dependencies", ())))
+
+    def dependencies(self):
+
+        """Return every template file some page was rendered with"""
+
+        return {path for entry in self.entries.values() for path in entry.get("dependencies", ())}
+
+    def remove_stale(self):
+
+        """Drop entries whose source was not seen this build and delete their outputs"""
+
+        return [self.remove(source) for source in sorted(set(self.entries) - self.seen)]
+
+    def remove(self, source):
+
+        """Forget a source and delete its output, returning the output path"""
+
+        self.seen.discard(source)
+        output = self.entries.pop(source)["output"]
+        if os.path.exists(output):
+            os.remove(output)
+        return output
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "pages": self.entries}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
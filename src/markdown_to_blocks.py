@@ -1,3 +1,6 @@
+import io
+import re
+from collections import namedtuple
 from enum import Enum
 from htmlnode import (ParentNode, LeafNode, text_node_to_html_node)
 from textnode import (TextNode, TextType)
@@ -12,62 +15,92 @@ class BlockType(Enum):
     O_LIST = "Ordered List"
 
 
-def markdown_to_blocks(markdown: str):
-    blocks = []
+def iter_blocks(lines):
+
+    """
+    Yield (line_number, block) pairs from an iterable of lines, such as an
+    open file, as soon as each block is complete. Only the current block is
+    held in memory. line_number is the 1-based line the block starts on.
+    """
+
     current_block = []
-    
-    for line in markdown.split('\n'):
+    start = None
+
+    for number, line in enumerate(lines, 1):
+        line = line.rstrip('\n')
         if line.strip():
+            if not current_block:
+                start = number
             current_block.append(line)
         elif current_block:
-            blocks.append('\n'.join(current_block))
+            yield start, '\n'.join(current_block).strip()
             current_block = []
-    
+
     if current_block:
-        blocks.append('\n'.join(current_block))
-    
-    return [block.strip() for block in blocks if block.strip()]
+        yield start, '\n'.join(current_block).strip()
+
+def markdown_to_blocks(markdown: str):
+    return [block for _, block in iter_blocks(io.StringIO(markdown))]
 
 def normalize_text(text):
 
     """Normalize text by removing extra whitespace and indentation"""
 
-    lines = text.split('\n')
+    return normalize_lines(text.split('\n'))
 
-    while lines and not lines[0].strip():
-        lines.pop(0)
-    while lines and not lines[-1].strip():
-        lines.pop()
+def normalize_lines(lines):
 
+    """Join lines into a single line, dropping blank lines at either end"""
 
-    if lines:
-        min_indent = min(len(line) - len(line.lstrip()) for line in lines if line.strip())
-        lines = [line[min_indent:] if line.strip() else line for line in lines]
-    return ' '.join(line.strip() for line in lines)
+    start, end = 0, len(lines)
+    while start < end and not lines[start].strip():
+        start += 1
+    while end > start and not lines[end - 1].strip():
+        end -= 1
+    return ' '.join(line.strip() for line in lines[start:end])
 
-def block_to_block_type(block):
+ClassifiedBlock = namedtuple("ClassifiedBlock", ["block_type", "lines", "level"])
 
+def classify_block(block):
+
+    """
+    Classify a block in a single scan of its lines.
+    Returns a ClassifiedBlock with the type, the block split into lines
+    (None for headings) and the heading level (0 for other types).
+    """
 
     if block.startswith("#"):
-        if any(block.startswith(h + " ") for h in ["#", "##", "###", "####", "#####", "######"]):
-            return BlockType.HEAD
-        return BlockType.PARA 
-    
-    elif block.startswith("```") and block.endswith("```"):
-        return BlockType.CODE
-    
-    elif all(line.startswith(">") for line in block.split("\n")):
-        return BlockType.QUOTE
-    
-    elif all(line.startswith(("* ", "- ")) for line in block.split("\n")):
-        return BlockType.U_LIST
-    
-    elif all(line.split(". ")[0].isdigit() and int(line.split(". ")[0]) == idx + 1 
-            for idx, line in enumerate(block.split("\n"))):
-        return BlockType.O_LIST
-    
-    else:
-        return BlockType.PARA
+        level = len(block) - len(block.lstrip("#"))
+        if level <= 6 and block[level:level + 1] == " ":
+            return ClassifiedBlock(BlockType.HEAD, None, level)
+        return ClassifiedBlock(BlockType.PARA, block.split("\n"), 0)
+
+    lines = block.split("\n")
+
+    if block.startswith("```") and block.endswith("```"):
+        return ClassifiedBlock(BlockType.CODE, lines, 0)
+
+    quote = u_list = o_list = True
+    for idx, line in enumerate(lines):
+        if quote and not line.startswith(">"):
+            quote = False
+        if u_list and not line.startswith(("* ", "- ")):
+            u_list = False
+        if o_list:
+            dot = line.find(". ")
+            number = line if dot == -1 else line[:dot]
+            o_list = number.isdigit() and int(number) == idx + 1
+        if not (quote or u_list or o_list):
+            return ClassifiedBlock(BlockType.PARA, lines, 0)
+
+    if quote:
+        return ClassifiedBlock(BlockType.QUOTE, lines, 0)
+    if u_list:
+        return ClassifiedBlock(BlockType.U_LIST, lines, 0)
+    return ClassifiedBlock(BlockType.O_LIST, lines, 0)
+
+def block_to_block_type(block):
+    return classify_block(block).block_type
 
 
 def extract_heading_level(block):
@@ -82,31 +115,46 @@ def extract_heading_level(block):
             break
     return level
 
-def extract_text_content(block, block_type):
+def list_items(lines):
+
+    """Strip the list markers from the lines of a list block"""
+
+    items = []
+    for line in lines:
+        if '.' in line:
+            items.append(line.split('. ', 1)[-1].strip())
+        else:
+            items.append(line.lstrip('- *').strip())
+    return items
+
+def extract_text_content(block, block_type, lines=None):
 
-    """Extract the actual text content from different block types"""
+    """
+    Extract the actual text content from different block types.
+    lines may be passed in from classify_block to avoid splitting again.
+    """
 
     if block_type == BlockType.HEAD:
         return block.lstrip('#').strip()
-    
-    elif block_type == BlockType.CODE:
-
 
+    if lines is None:
         lines = block.split('\n')
+    
+    if block_type == BlockType.CODE:
 
-        while lines and not lines[0].strip():
-            lines.pop(0)
-        while lines and not lines[-1].strip():
-            lines.pop()
-        
-
-        if lines and lines[0].strip().startswith('```'):
-            lines = lines[1:]
+        start, end = 0, len(lines)
+        while start < end and not lines[start].strip():
+            start += 1
+        while end > start and not lines[end - 1].strip():
+            end -= 1
 
-        if lines and lines[-1].strip() == '```':
-            lines = lines[:-1]
+        if start < end and lines[start].strip().startswith('```'):
+            start += 1
 
+        if start < end and lines[end - 1].strip() == '```':
+            end -= 1
 
+        lines = lines[start:end]
         if lines:
             indent_size = min(len(line) - len(line.lstrip()) 
                               for line in lines if line.strip())
@@ -115,20 +163,12 @@ def extract_text_content(block, block_type):
         return '\n'.join(lines) + '\n'
     
     elif block_type == BlockType.QUOTE:
-        lines = [line.lstrip('>').strip() for line in block.split('\n')]
-        return normalize_text('\n'.join(lines))
+        return normalize_lines([line.lstrip('>').strip() for line in lines])
     
     elif block_type in [BlockType.U_LIST, BlockType.O_LIST]:
-        lines = block.split('\n')
-        items = []
-        for line in lines:
-            if '.' in line:
-                items.append(line.split('. ', 1)[-1].strip())
-            else:
-                items.append(line.lstrip('- *').strip())
-        return '\n'.join(items)
+        return '\n'.join(list_items(lines))
     
-    return normalize_text(block)
+    return normalize_lines(lines)
 
 def text_to_textnode(text):
     """Convert markdown text with inline formatting to TextNode"""
@@ -152,62 +192,203 @@ def text_to_textnode(text):
     
     return TextNode(text, TextType.TEXT)
 
-def text_to_children(text):
+def text_to_children(text, basepath="/", assets=None):
     """Convert text with inline markdown to list of HTMLNodes"""
 
     nodes = text_to_textnodes(text)
-    return [text_node_to_html_node(node) for node in nodes]
+    return [text_node_to_html_node(node, basepath, assets) for node in nodes]
 
-def markdown_to_html_node(markdown):
+def block_to_html_node(block, children=text_to_children):
 
-    """
-    Convert a full markdown document into a single parent HTMLNode (<div>).
-    Each block is converted to the appropriate HTMLNode and added as a child.
-    """
+    """Convert a single markdown block into its HTMLNode"""
 
+    block_type, lines, level = classify_block(block)
 
-    blocks = markdown_to_blocks(markdown)
-    parent_node = ParentNode("div", [])
+    if block_type in (BlockType.U_LIST, BlockType.O_LIST):
+        items = [ParentNode("li", children(item)) for item in list_items(lines)]
+        return ParentNode("ul" if block_type == BlockType.U_LIST else "ol", items)
+
+    content = extract_text_content(block, block_type, lines)
+
+    if block_type == BlockType.HEAD:
+        return ParentNode(f"h{level}", children(content))
+
+    elif block_type == BlockType.CODE: 
+        return ParentNode("pre", [LeafNode("code", content)])
 
-    for block in blocks:
-        block_type = block_to_block_type(block)
-        content = extract_text_content(block, block_type)
+    elif block_type == BlockType.QUOTE:
+        return ParentNode("blockquote", [ParentNode("p", children(content))])
+
+    return ParentNode("p", children(content))
 
-        if block_type == BlockType.HEAD:
-            level = extract_heading_level(block)
-            node = ParentNode(f"h{level}", text_to_children(content))
+def inline_children(timer=None, document=None, basepath="/", assets=None):
 
-        elif block_type == BlockType.CODE: 
-            text_node = TextNode(content, TextType.TEXT)
-            node = ParentNode("pre", [LeafNode("code", text_node.text)])
+    """Return the text -> child HTMLNodes function for the given timer/document/urls"""
 
-        elif block_type == BlockType.QUOTE:
-            node = ParentNode("blockquote", [ParentNode("p", text_to_children(content))])
+    if document is None and basepath == "/" and not assets:
+        children = text_to_children
+    else:
+        def children(text):
+            nodes = text_to_textnodes(text)
+            if document is not None:
+                document.add_inline(nodes)
+            return [text_node_to_html_node(node, basepath, assets) for node in nodes]
 
-        elif block_type == BlockType.U_LIST:
-            items = [ParentNode("li", text_to_children(line.strip()))
-                     for line in content.split('\n')]
-            node = ParentNode("ul", items)
+    if timer is not None:
+        children = timer.timed("inline", children)
+    return children
 
-        elif block_type == BlockType.O_LIST:
-            items = [ParentNode("li", text_to_children(line.strip()))
-                     for line in content.split('\n')]
-            node = ParentNode("ol", items)
+def blocks_to_html_node(blocks, timer=None, document=None, memo=None, basepath="/", assets=None):
 
-        else:  
-            node = ParentNode("p", text_to_children(content))
+    """
+    Build the <div> HTMLNode from (line_number, block) pairs as they arrive.
+    Errors are re-raised with the line number of the offending block.
+    When a build_report.PageTimer is given, inline parsing time is added to
+    its "inline" phase. When a Document is given, its metadata is filled in
+    during the same pass. With a block_memo.BlockMemo, blocks seen before are
+    not parsed again: their rendered HTML and metadata come from the memo.
+    Root-relative link and image urls are prefixed with basepath, and mapped
+    to fingerprinted names through assets, as the nodes are created, so the
+    memo must only be shared within one basepath and asset map.
+    """
 
+    children = inline_children(timer, document, basepath, assets)
+    parent_node = ParentNode("div", [])
+
+    for line_number, block in blocks:
+        if memo is not None:
+            entry = memo.get(block)
+            if entry is None:
+                block_document = Document()
+                node = convert_block(block, line_number, inline_children(timer, block_document, basepath, assets),
+                                     block_document)
+                entry = (LeafNode(None, node.to_html()), block_document)
+                memo.put(block, entry)
+            node, block_document = entry
+            if document is not None:
+                document.merge(block_document)
+        else:
+            node = convert_block(block, line_number, children, document)
         parent_node.children.append(node)
 
     return parent_node
 
+def convert_block(block, line_number, children, document=None):
+    try:
+        node = block_to_html_node(block, children)
+    except ValueError as exc:
+        raise ValueError(f"line {line_number}: {exc}") from exc
+    if document is not None:
+        document.add_block(block, node)
+    return node
+
+def markdown_to_html_node(markdown, timer=None, basepath="/", assets=None):
 
+    """
+    Convert a full markdown document into a single parent HTMLNode (<div>).
+    Each block is converted to the appropriate HTMLNode and added as a child.
+    markdown may be a string or an iterable of lines such as an open file,
+    which is then read lazily block by block.
+    """
+
+    lines = io.StringIO(markdown) if isinstance(markdown, str) else markdown
+    return blocks_to_html_node(iter_blocks(lines), timer, basepath=basepath, assets=assets)
+
+HEADING_TAGS = {f"h{level}": level for level in range(1, 7)}
+TERM_PATTERN = re.compile(r"\w+")
+MIN_TERM_LENGTH = 2
+HEADING_WEIGHT = 5
+
+class Document():
+
+    """
+    A parsed page: the HTML tree plus metadata collected while parsing.
+    title is the first "# " heading as written in the markdown, outline is
+    a list of (level, text) headings, images and links are (text, url) pairs.
+    terms maps the lowercased words of the text to their search weight.
+    """
+
+    __slots__ = ("html_node", "title", "outline", "word_count", "images", "links", "terms")
+
+    def __init__(self):
+        self.html_node = None
+        self.title = None
+        self.outline = []
+        self.word_count = 0
+        self.images = []
+        self.links = []
+        self.terms = {}
+
+    def add_terms(self, text, weight=1):
+        for term in TERM_PATTERN.findall(text.lower()):
+            if len(term) >= MIN_TERM_LENGTH:
+                self.terms[term] = self.terms.get(term, 0) + weight
+
+    def add_inline(self, text_nodes):
+        for node in text_nodes:
+            if node.text_type == TextType.IMAGE:
+                self.images.append((node.text, node.url))
+                continue
+            if node.text_type == TextType.LINK:
+                self.links.append((node.text, node.url))
+            self.word_count += len(node.text.split())
+            self.add_terms(node.text)
+
+    def add_block(self, block, node):
+        if self.title is None:
+            self.title = title_from_block(block)
+        level = HEADING_TAGS.get(node.tag)
+        if level is not None:
+            heading = "".join(child.value for child in node.children)
+            self.outline.append((level, heading))
+            # Heading words were already counted once as inline text
+            self.add_terms(heading, HEADING_WEIGHT - 1)
+
+    def merge(self, other):
+
+        """Append the metadata of a document that follows this one"""
+
+        if self.title is None:
+            self.title = other.title
+        self.outline.extend(other.outline)
+        self.word_count += other.word_count
+        self.images.extend(other.images)
+        self.links.extend(other.links)
+        for term, weight in other.terms.items():
+            self.terms[term] = self.terms.get(term, 0) + weight
+
+    def metadata(self):
+        return {
+            "title": self.title,
+            "outline": self.outline,
+            "word_count": self.word_count,
+            "images": self.images,
+            "links": self.links,
+            "terms": self.terms,
+        }
+
+def parse_document(markdown, timer=None, memo=None, basepath="/", assets=None):
+
+    """
+    Parse markdown (a string or an iterable of lines) into a Document in a
+    single pass over its blocks, with urls resolved against basepath and
+    the assets fingerprint map.
+    """
+
+    lines = io.StringIO(markdown) if isinstance(markdown, str) else markdown
+    document = Document()
+    document.html_node = blocks_to_html_node(iter_blocks(lines), timer, document, memo, basepath, assets)
+    return document
+
+def title_from_block(block):
+    if block.startswith("# "):
+        return block.lstrip("#").strip()
+    return None
 
 def extract_title(markdown):
     
-    blocks = markdown_to_blocks(markdown)
-    for block in blocks:
-        if block.startswith("# "):
-            return block.lstrip("#").strip()
+    for _, block in iter_blocks(io.StringIO(markdown)):
+        title = title_from_block(block)
+        if title is not None:
+            return title
     return None
-    
@@ -0,0 +1,111 @@
+import queue
+import threading
+
+DEFAULT_DEPTH = 16
+POLL_INTERVAL = 0.1
+
+_DONE = object()
+
+
+class PipelineError(Exception):
+
+    """Raised by run_pipeline when a stage fails; the stage's exception is the __cause__"""
+
+    def __init__(self, item):
+        super().__init__(f"pipeline stage failed for {item!r}")
+        self.item = item
+
+
+class _Failure():
+
+    __slots__ = ("item", "exc")
+
+    def __init__(self, item, exc):
+        self.item = item
+        self.exc = exc
+
+
+def _put(outbox, entry, stop):
+    while not stop.is_set():
+        try:
+            outbox.put(entry, timeout=POLL_INTERVAL)
+            return True
+        except queue.Full:
+            pass
+    return False
+
+
+def _get(inbox, stop):
+    while not stop.is_set():
+        try:
+            return inbox.get(timeout=POLL_INTERVAL)
+        except queue.Empty:
+            pass
+    return _DONE
+
+
+def _read_stage(items, func, outbox, stop):
+    for item in items:
+        if stop.is_set():
+            return
+        try:
+            entry = (item, func(item))
+        except BaseException as exc:
+            _put(outbox, _Failure(item, exc), stop)
+            return
+        if not _put(outbox, entry, stop):
+            return
+    _put(outbox, _DONE, stop)
+
+
+def _stage(func, inbox, outbox, stop):
+    while True:
+        entry = _get(inbox, stop)
+        if entry is _DONE or isinstance(entry, _Failure):
+            _put(outbox, entry, stop)
+            return
+        item, value = entry
+        try:
+            entry = (item, func(value))
+        except BaseException as exc:
+            entry = _Failure(item, exc)
+        if not _put(outbox, entry, stop) or isinstance(entry, _Failure):
+            return
+
+
+def run_pipeline(items, read, render, write, depth=DEFAULT_DEPTH):
+
+    """
+    Run every item through read -> render -> write and yield write's
+    results in the order of items. Each stage runs in its own thread and
+    the stages are connected by queues holding at most depth entries, so
+    reading ahead and writing behind overlap rendering without buffering
+    the whole input. The first failure stops the pipeline and is re-raised
+    as a PipelineError naming the item.
+    """
+
+    stop = threading.Event()
+    rendering = queue.Queue(depth)
+    writing = queue.Queue(depth)
+    results = queue.Queue()
+
+    threads = [
+        threading.Thread(target=_read_stage, args=(items, read, rendering, stop), daemon=True),
+        threading.Thread(target=_stage, args=(render, rendering, writing, stop), daemon=True),
+        threading.Thread(target=_stage, args=(write, writing, results, stop), daemon=True),
+    ]
+    for thread in threads:
+        thread.start()
+
+    try:
+        while True:
+            entry = results.get()
+            if entry is _DONE:
+                return
+            if isinstance(entry, _Failure):
+                raise PipelineError(entry.item) from entry.exc
+            yield entry[1]
+    finally:
+        stop.set()
+        for thread in threads:
+            thread.join()
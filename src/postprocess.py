@@ -0,0 +1,175 @@
+import gzip
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+PRESERVED_PATTERN = re.compile(r"(<(pre|textarea|script|style)\b[^>]*>)(.*?)(</\2\s*>)", re.S | re.I)
+COMMENT_PATTERN = re.compile(r"<!--(?!\[if).*?-->", re.S)
+TAG_PATTERN = re.compile(r"(<[^>]*>)")
+TAG_NAME_PATTERN = re.compile(r"</?([!\w-]+)")
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+# Whitespace next to these tags never renders, so it can be dropped
+BLOCK_TAGS = frozenset("""
+    !doctype html head body title meta link base div p ul ol li dl dt dd h1 h2 h3 h4 h5 h6
+    article section aside header footer nav main blockquote figure figcaption table thead
+    tbody tfoot tr td th hr br form pre textarea script style
+""".split())
+
+CSS_STRING_PATTERN = re.compile(r"(\"(?:\\.|[^\"\\])*\"|'(?:\\.|[^'\\])*')")
+CSS_COMMENT_PATTERN = re.compile(r"/\*.*?\*/", re.S)
+CSS_PUNCTUATION_PATTERN = re.compile(r"\s*([{};,>])\s*")
+CSS_COLON_PATTERN = re.compile(r":\s+")
+
+COMPRESSIBLE = (".html", ".css", ".js", ".svg", ".xml", ".json", ".txt")
+COMPRESSED_SUFFIXES = (".gz", ".br")
+
+
+def is_block_tag(tag):
+    match = TAG_NAME_PATTERN.match(tag)
+    return match is not None and match.group(1).lower() in BLOCK_TAGS
+
+
+def minify_markup(markup, after_block=False, before_block=False):
+
+    """Collapse whitespace in text between tags, leaving the tags themselves alone"""
+
+    parts = TAG_PATTERN.split(COMMENT_PATTERN.sub("", markup))
+    for index in range(0, len(parts), 2):
+        text = WHITESPACE_PATTERN.sub(" ", parts[index])
+        if (is_block_tag(parts[index - 1]) if index > 0 else after_block):
+            text = text.lstrip()
+        if (is_block_tag(parts[index + 1]) if index + 1 < len(parts) else before_block):
+            text = text.rstrip()
+        parts[index] = text
+    return "".join(parts)
+
+
+def minify_html(html):
+
+    """
+    Minify an HTML page: drop comments and whitespace that can't render.
+    The contents of <pre>, <textarea> and <script> are kept byte for byte,
+    and <style> contents are minified as CSS.
+    """
+
+    output = []
+    position = 0
+    for match in PRESERVED_PATTERN.finditer(html):
+        output.append(minify_markup(html[position:match.start()], position > 0, True))
+        opening, name, body, closing = match.groups()
+        if name.lower() == "style":
+            body = minify_css(body)
+        output.append(opening + body + closing)
+        position = match.end()
+    output.append(minify_markup(html[position:], position > 0, False))
+    return "".join(output)
+
+
+def minify_css(css):
+
+    """Drop comments and redundant whitespace from a stylesheet, leaving strings intact"""
+
+    parts = CSS_STRING_PATTERN.split(css)
+    for index in range(0, len(parts), 2):
+        text = CSS_COMMENT_PATTERN.sub("", parts[index])
+        text = WHITESPACE_PATTERN.sub(" ", text)
+        text = CSS_PUNCTUATION_PATTERN.sub(r"\1", text)
+        parts[index] = CSS_COLON_PATTERN.sub(":", text).replace(";}", "}")
+    return "".join(parts).strip()
+
+
+def compressed_paths(path):
+    suffixes = COMPRESSED_SUFFIXES if brotli is not None else COMPRESSED_SUFFIXES[:1]
+    return [path + suffix for suffix in suffixes]
+
+
+def is_precompressed(path, mtime_ns):
+
+    """Siblings carry their source's mtime, so a match means they are current"""
+
+    for sibling in compressed_paths(path):
+        try:
+            if os.stat(sibling).st_mtime_ns != mtime_ns:
+                return False
+        except FileNotFoundError:
+            return False
+    return True
+
+
+def remove_compressed(path):
+
+    """
+    Remove path's .gz and .br siblings, which would otherwise be served in
+    place of a rewritten path until the next --precompress build
+    """
+
+    for sibling in (path + suffix for suffix in COMPRESSED_SUFFIXES):
+        try:
+            os.remove(sibling)
+        except FileNotFoundError:
+            pass
+
+
+def write_sibling(path, data, mtime_ns):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.utime(tmp_path, ns=(mtime_ns, mtime_ns))
+    os.replace(tmp_path, path)
+
+
+def precompress(path):
+
+    """Write path.gz (and path.br when brotli is installed) next to path"""
+
+    stat = os.stat(path)
+    with open(path, "rb") as f:
+        data = f.read()
+    write_sibling(path + ".gz", gzip.compress(data, compresslevel=9, mtime=0), stat.st_mtime_ns)
+    if brotli is not None:
+        write_sibling(path + ".br", brotli.compress(data), stat.st_mtime_ns)
+    return path
+
+
+def precompress_tree(directory, workers=1, static=None):
+
+    """
+    Precompress every compressible file under directory, skipping files
+    whose siblings are current and removing siblings whose source is gone.
+    Siblings that are files in the static directory were published as they
+    are: they are never removed, and their sources are not recompressed.
+    With workers > 1 files are compressed in a process pool.
+    Returns (compressed, removed).
+    """
+
+    def is_static(path):
+        return static is not None and os.path.isfile(os.path.join(static, os.path.relpath(path, directory)))
+
+    pending = []
+    removed = []
+    for root, dirs, files in os.walk(directory):
+        dirs.sort()
+        names = set(files)
+        for name in sorted(files):
+            path = os.path.join(root, name)
+            base, suffix = os.path.splitext(name)
+            if suffix in COMPRESSED_SUFFIXES and base.endswith(COMPRESSIBLE):
+                if base not in names and not is_static(path):
+                    os.remove(path)
+                    removed.append(path)
+            elif (name.endswith(COMPRESSIBLE) and not is_precompressed(path, os.stat(path).st_mtime_ns)
+                    and not any(is_static(sibling) for sibling in compressed_paths(path))):
+                pending.append(path)
+
+    if workers > 1 and len(pending) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            compressed = list(executor.map(precompress, pending, chunksize=16))
+    else:
+        compressed = [precompress(path) for path in pending]
+    return compressed, removed
@@ -0,0 +1,68 @@
+// Client for the index written by `main.py --search`. Include this script
+// from the search directory, then call siteSearch("some words"), which
+// resolves to [{url, title, score}, ...] for pages containing every word
+// (as a prefix), best first. Shards are fetched on demand and cached.
+(function () {
+  var base = document.currentScript.src.replace(/[^\/]*$/, "");
+  var index = null;
+  var shards = {};
+
+  function fetchJson(name) {
+    return fetch(base + name).then(function (response) { return response.json(); });
+  }
+
+  // Must match markdown_to_blocks.TERM_PATTERN and MIN_TERM_LENGTH
+  function terms(text) {
+    return (text.toLowerCase().match(/[\p{L}\p{N}_]+/gu) || []).filter(function (term) {
+      return Array.from(term).length >= 2;
+    });
+  }
+
+  function shardName(key) {
+    return Array.from(new TextEncoder().encode(key), function (byte) {
+      return byte.toString(16).padStart(2, "0");
+    }).join("") + ".json";
+  }
+
+  function loadShard(word) {
+    var key = Array.from(word).slice(0, index.prefix).join("");
+    if (index.shards.indexOf(key) < 0) return Promise.resolve({});
+    return shards[key] || (shards[key] = fetchJson(shardName(key)));
+  }
+
+  function matches(shard, word) {
+    var found = {};
+    Object.keys(shard).forEach(function (term) {
+      if (term.lastIndexOf(word, 0) !== 0) return;
+      var postings = shard[term];
+      for (var i = 0; i < postings.length; i += 2) {
+        found[postings[i]] = (found[postings[i]] || 0) + postings[i + 1];
+      }
+    });
+    return found;
+  }
+
+  window.siteSearch = function (query) {
+    var words = terms(query);
+    var loading = index ? Promise.resolve() : fetchJson("index.json").then(function (data) { index = data; });
+    return loading.then(function () {
+      return Promise.all(words.map(loadShard));
+    }).then(function (loaded) {
+      var scores = null;
+      words.forEach(function (word, i) {
+        var found = matches(loaded[i], word);
+        if (scores === null) {
+          scores = found;
+          return;
+        }
+        Object.keys(scores).forEach(function (id) {
+          if (id in found) scores[id] += found[id];
+          else delete scores[id];
+        });
+      });
+      return Object.keys(scores || {}).sort(function (a, b) { return scores[b] - scores[a]; }).map(function (id) {
+        return {url: index.pages[id][0], title: index.pages[id][1], score: scores[id]};
+      });
+    });
+  };
+})();
@@ -0,0 +1,178 @@
+import filecmp
+import heapq
+import json
+import os
+import shutil
+
+INDEX_FORMAT = 1
+INDEX_NAME = "index.json"
+CLIENT_NAME = "search.js"
+CLIENT_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "search_client.js")
+PREFIX_LENGTH = 2
+
+
+def shard_key(term):
+    return term[:PREFIX_LENGTH]
+
+
+def shard_name(key):
+
+    """File name of a shard; hex keeps any prefix a safe, portable name"""
+
+    return key.encode("utf-8").hex() + ".json"
+
+
+def write_json(path, data):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, separators=(",", ":"), ensure_ascii=False, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+class SearchIndex():
+
+    """
+    A full-text index of the site for client-side search, built from the
+    terms collected while pages are parsed. output_dir gets index.json (page
+    urls and titles by id, and the shard prefixes) and one shard per term
+    prefix mapping each term to flat [page id, weight, ...] postings, so a
+    client only fetches the shards for what is being searched.
+    Each page's id, source hash and shard prefixes are kept in state_path,
+    so a build only rewrites the shards touched by the pages it changed.
+    """
+
+    def __init__(self, state_path, output_dir):
+        self.state_path = state_path
+        self.output_dir = output_dir
+        self.pages = {}
+        self.changed = {}
+        self.load()
+        # Without state, shards left in output_dir can't be trusted
+        self.stale_shards = not self.pages
+
+    def load(self):
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if data.get("version") != INDEX_FORMAT:
+            return
+        if not os.path.exists(os.path.join(self.output_dir, INDEX_NAME)):
+            # The published index is gone (e.g. --clean), so every page is indexed again
+            return
+        self.pages = data.get("pages", {})
+
+    def needs_update(self, source, source_hash, url=None):
+        entry = self.pages.get(source)
+        return entry is None or entry["hash"] != source_hash or (url is not None and entry["url"] != url)
+
+    def update_page(self, source, source_hash, url, title, terms):
+        self.changed[source] = (source_hash, url, title, terms)
+
+    def retain(self, sources):
+
+        """Drop every indexed page whose source is not in sources"""
+
+        for source in set(self.pages).difference(sources):
+            self.changed[source] = None
+
+    def write(self):
+
+        """
+        Apply the pending page changes to the affected shards, write the
+        index and client, and save the state. Returns the shard files written.
+        """
+
+        if not self.changed and os.path.exists(os.path.join(self.output_dir, INDEX_NAME)):
+            return []
+        os.makedirs(self.output_dir, exist_ok=True)
+        if self.stale_shards:
+            for name in self.shard_names():
+                os.remove(os.path.join(self.output_dir, name))
+            self.stale_shards = False
+
+        # Ids stay stable across builds; the lowest free id is reused first
+        used = {entry["id"] for entry in self.pages.values()}
+        next_id = max(used, default=-1) + 1
+        free = sorted(set(range(next_id)).difference(used))
+
+        dirty = set()
+        affected = set()
+        additions = {}
+        for source, change in sorted(self.changed.items()):
+            entry = self.pages.pop(source, None)
+            if entry is not None:
+                dirty.add(entry["id"])
+                affected.update(entry["keys"])
+                heapq.heappush(free, entry["id"])
+            if change is None:
+                continue
+
+            source_hash, url, title, terms = change
+            if free:
+                page_id = heapq.heappop(free)
+            else:
+                page_id = next_id
+                next_id += 1
+            keys = sorted({shard_key(term) for term in terms})
+            self.pages[source] = {"id": page_id, "hash": source_hash, "url": url, "title": title, "keys": keys}
+            dirty.add(page_id)
+            affected.update(keys)
+            for term, weight in terms.items():
+                additions.setdefault(shard_key(term), {}).setdefault(term, []).extend((page_id, weight))
+
+        written = []
+        for key in sorted(affected):
+            path = os.path.join(self.output_dir, shard_name(key))
+            shard = self.read_shard(path)
+            for term in list(shard):
+                postings = shard[term]
+                kept = [value for i in range(0, len(postings), 2) if postings[i] not in dirty
+                        for value in postings[i:i + 2]]
+                if kept:
+                    shard[term] = kept
+                else:
+                    del shard[term]
+            for term, postings in additions.get(key, {}).items():
+                shard.setdefault(term, []).extend(postings)
+
+            if shard:
+                write_json(path, shard)
+                written.append(path)
+            elif os.path.exists(path):
+                os.remove(path)
+
+        self.changed = {}
+        self.write_index(next_id)
+        self.save()
+        return written
+
+    def shard_names(self):
+        return [name for name in os.listdir(self.output_dir) if name.endswith(".json") and name != INDEX_NAME]
+
+    def read_shard(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+
+    def write_index(self, size):
+        table = [None] * size
+        for entry in self.pages.values():
+            table[entry["id"]] = [entry["url"], entry["title"]]
+        while table and table[-1] is None:
+            table.pop()
+
+        keys = sorted(bytes.fromhex(name[:-len(".json")]).decode("utf-8") for name in self.shard_names())
+        write_json(os.path.join(self.output_dir, INDEX_NAME),
+                   {"version": INDEX_FORMAT, "prefix": PREFIX_LENGTH, "pages": table, "shards": keys})
+
+        client = os.path.join(self.output_dir, CLIENT_NAME)
+        if not os.path.exists(client) or not filecmp.cmp(CLIENT_SOURCE, client, shallow=False):
+            shutil.copyfile(CLIENT_SOURCE, client)
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        write_json(self.state_path, {"version": INDEX_FORMAT, "pages": self.pages})
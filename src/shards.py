@@ -0,0 +1,182 @@
+import hashlib
+import json
+import os
+import shutil
+
+from manifest import hash_file
+from postprocess import COMPRESSED_SUFFIXES
+
+SHARD_MANIFEST_NAME = ".shard.json"
+SHARD_FORMAT = 1
+
+
+def parse_shard(text):
+
+    """Parse "i/N" (1 <= i <= N) into (i, N)"""
+
+    try:
+        index, count = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise ValueError(f"invalid shard {text!r}, expected i/N such as 2/4") from None
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"invalid shard {text!r}, i must be between 1 and N")
+    return index, count
+
+
+def page_key(source, content_dir):
+    return os.path.relpath(source, content_dir).replace(os.sep, "/")
+
+
+def shard_of(source, content_dir, count):
+
+    """Stable 1-based shard of a page, from a hash of its path relative to content_dir"""
+
+    digest = hashlib.sha256(page_key(source, content_dir).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % count + 1
+
+
+def select_shard(pages, content_dir, shard):
+
+    """Keep the (source, dest) pairs that belong to shard (i, N)"""
+
+    index, count = shard
+    return [(source, dest) for source, dest in pages if shard_of(source, content_dir, count) == index]
+
+
+def pages_digest(pages, content_dir):
+    keys = sorted(page_key(source, content_dir) for source, _ in pages)
+    return hashlib.sha256("\n".join(keys).encode("utf-8")).hexdigest()
+
+
+def write_shard_manifest(dest_dir, content_dir, pages, shard):
+
+    """
+    Record what one shard built: its pages, a digest of every discovered
+    page so merge can tell the shards saw the same site, and the hash of
+    every file in dest_dir so merge can detect collisions. Outputs of pages
+    that belong to other shards (left over from an earlier build into the
+    same directory) are not listed, so they are never merged.
+    """
+
+    def relative_path(path):
+        return os.path.relpath(path, dest_dir).replace(os.sep, "/")
+
+    index, count = shard
+
+    own_pages = {page_key(source, content_dir): relative_path(dest)
+                 for source, dest in select_shard(pages, content_dir, shard)}
+    other_outputs = {relative_path(dest) for _, dest in pages} - set(own_pages.values())
+
+    files = {}
+    for root, dirs, names in os.walk(dest_dir):
+        dirs.sort()
+        for name in sorted(names):
+            path = os.path.join(root, name)
+            relative = relative_path(path)
+            base, suffix = os.path.splitext(relative)
+            if suffix not in COMPRESSED_SUFFIXES:
+                base = relative
+            if relative != SHARD_MANIFEST_NAME and base not in other_outputs:
+                files[relative] = hash_file(path)
+
+    data = {
+        "version": SHARD_FORMAT,
+        "shard": index,
+        "count": count,
+        "total_pages": len(pages),
+        "discovered": pages_digest(pages, content_dir),
+        "pages": own_pages,
+        "files": files,
+    }
+    path = os.path.join(dest_dir, SHARD_MANIFEST_NAME)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=1, sort_keys=True)
+    return path
+
+
+def load_shard_manifest(shard_dir):
+    path = os.path.join(shard_dir, SHARD_MANIFEST_NAME)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        raise ValueError(f"{shard_dir} has no {SHARD_MANIFEST_NAME}; was it built with --shard?") from None
+    if data.get("version") != SHARD_FORMAT:
+        raise ValueError(f"{path}: unsupported shard manifest version {data.get('version')}")
+    return data
+
+
+def check_shards(manifests):
+
+    """Return a list of problems (gaps, collisions, mismatches) with a set of shard manifests"""
+
+    problems = []
+    first = next(iter(manifests.values()))
+    count = first["count"]
+
+    for shard_dir, data in manifests.items():
+        if (data["count"], data["discovered"]) != (count, first["discovered"]):
+            problems.append(f"{shard_dir} was built as shard {data['shard']}/{data['count']} of a "
+                            f"different page set or shard count")
+
+    seen = {}
+    for shard_dir, data in manifests.items():
+        if data["shard"] in seen:
+            problems.append(f"shard {data['shard']} appears twice: {seen[data['shard']]} and {shard_dir}")
+        seen[data["shard"]] = shard_dir
+    missing = sorted(set(range(1, count + 1)) - set(seen))
+    if missing:
+        problems.append(f"missing shards: {', '.join(f'{index}/{count}' for index in missing)}")
+
+    owners = {}
+    for shard_dir, data in manifests.items():
+        for page in data["pages"]:
+            if page in owners:
+                problems.append(f"page {page} built by both {owners[page]} and {shard_dir}")
+            owners[page] = shard_dir
+    if not missing and len(owners) != first["total_pages"]:
+        problems.append(f"shards built {len(owners)} pages but {first['total_pages']} were discovered")
+
+    hashes = {}
+    for shard_dir, data in manifests.items():
+        for relative, digest in data["files"].items():
+            if relative in hashes and hashes[relative][1] != digest:
+                problems.append(f"{relative} differs between {hashes[relative][0]} and {shard_dir}")
+            hashes.setdefault(relative, (shard_dir, digest))
+            if not os.path.isfile(os.path.join(shard_dir, relative)):
+                problems.append(f"{relative} is listed by {shard_dir} but missing")
+
+    return problems
+
+
+def merge_shards(shard_dirs, dest_dir):
+
+    """
+    Combine the outputs of shard builds into dest_dir after checking that
+    every shard 1..N is present exactly once, every page was built by one
+    shard, and no two shards wrote different files to the same path.
+    dest_dir is replaced. Returns the number of files merged.
+    """
+
+    if not shard_dirs:
+        raise ValueError("no shard directories to merge")
+    for shard_dir in shard_dirs:
+        if os.path.commonpath([os.path.abspath(shard_dir), os.path.abspath(dest_dir)]) == os.path.abspath(dest_dir):
+            raise ValueError(f"shard directory {shard_dir} is inside the merge destination {dest_dir}")
+    manifests = {shard_dir: load_shard_manifest(shard_dir) for shard_dir in shard_dirs}
+    problems = check_shards(manifests)
+    if problems:
+        raise ValueError("cannot merge shards:\n  " + "\n  ".join(problems))
+
+    if os.path.exists(dest_dir):
+        shutil.rmtree(dest_dir)
+    merged = set()
+    for shard_dir, data in sorted(manifests.items(), key=lambda item: item[1]["shard"]):
+        for relative in sorted(data["files"]):
+            if relative in merged:
+                continue
+            dest = os.path.join(dest_dir, relative)
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            shutil.copy2(os.path.join(shard_dir, relative), dest)
+            merged.add(relative)
+    return len(merged)
@@ -0,0 +1,181 @@
+import hashlib
+import heapq
+import json
+import os
+from datetime import datetime, timezone
+from xml.sax.saxutils import escape
+
+SITE_INDEX_VERSION = 1
+SITEMAP_NAME = "sitemap.xml"
+FEED_NAME = "atom.xml"
+# The sitemap protocol's limit on URLs per file
+SITEMAP_LIMIT = 50000
+FEED_ENTRIES = 20
+
+
+def timestamp(mtime):
+    return datetime.fromtimestamp(mtime, timezone.utc).isoformat(timespec="seconds")
+
+
+def sitemap_chunk_name(number):
+    return f"sitemap-{number}.xml"
+
+
+class SiteIndex():
+
+    """
+    A persisted index of every page's url, title and last content change,
+    from which sitemap.xml and an Atom feed (atom.xml) are written into
+    dest_dir with absolute urls under site_url (page urls already include
+    basepath). Pages are added as they are rendered, so the outputs never
+    need to be re-read, and files whose content hasn't changed are not
+    rewritten. Sites with more than SITEMAP_LIMIT pages get a sitemap index
+    pointing at numbered sitemaps. The feed's author is author, or the
+    feed title when none is given.
+    """
+
+    def __init__(self, path, dest_dir, site_url, basepath="/", author=None):
+        self.path = path
+        self.dest_dir = dest_dir
+        self.site_url = site_url.rstrip("/")
+        self.basepath = basepath
+        self.author = author
+        self.pages = {}
+        self.outputs = {}
+        self.changed = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") != SITE_INDEX_VERSION:
+            return
+        if not os.path.exists(os.path.join(self.dest_dir, SITEMAP_NAME)):
+            # The published sitemap is gone (e.g. --clean), so every page is indexed again
+            return
+        self.pages = data.get("pages", {})
+        if (data.get("site_url"), data.get("basepath"), data.get("author")) == (
+                self.site_url, self.basepath, self.author):
+            self.outputs = data.get("outputs", {})
+
+    def needs_update(self, source, source_hash, url=None):
+        entry = self.pages.get(source)
+        return entry is None or entry["hash"] != source_hash or (url is not None and entry["url"] != url)
+
+    def update_page(self, source, source_hash, url, title, mtime):
+        self.changed[source] = {"hash": source_hash, "url": url, "title": title, "updated": timestamp(mtime)}
+
+    def retain(self, sources):
+
+        """Drop every page whose source is not in sources"""
+
+        for source in set(self.pages).difference(sources):
+            self.changed[source] = None
+
+    def absolute(self, url):
+        return escape(self.site_url + url, {'"': "&quot;"})
+
+    def write(self):
+
+        """Write the sitemap and feed if any page changed; returns the files written"""
+
+        if not self.changed and self.outputs and all(
+                os.path.exists(os.path.join(self.dest_dir, name)) for name in self.outputs):
+            return []
+        for source, entry in self.changed.items():
+            if entry is None:
+                self.pages.pop(source, None)
+            else:
+                self.pages[source] = entry
+        self.changed = {}
+
+        entries = sorted(self.pages.values(), key=lambda entry: entry["url"])
+        chunks = [entries[i:i + SITEMAP_LIMIT] for i in range(0, len(entries), SITEMAP_LIMIT)] or [[]]
+        files = {}
+        if len(chunks) == 1:
+            files[SITEMAP_NAME] = self.urlset(chunks[0])
+        else:
+            for number, chunk in enumerate(chunks, 1):
+                files[sitemap_chunk_name(number)] = self.urlset(chunk)
+            files[SITEMAP_NAME] = self.sitemap_index(chunks)
+        files[FEED_NAME] = self.feed(entries)
+
+        os.makedirs(self.dest_dir, exist_ok=True)
+        written = []
+        outputs = {}
+        for name, text in files.items():
+            data = text.encode("utf-8")
+            outputs[name] = hashlib.sha256(data).hexdigest()
+            path = os.path.join(self.dest_dir, name)
+            if self.outputs.get(name) != outputs[name] or not os.path.exists(path):
+                with open(path, "wb") as f:
+                    f.write(data)
+                written.append(path)
+        for name in set(self.outputs).difference(outputs):
+            try:
+                os.remove(os.path.join(self.dest_dir, name))
+            except FileNotFoundError:
+                pass
+
+        self.outputs = outputs
+        self.save()
+        return written
+
+    def urlset(self, entries):
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+                 '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+        for entry in entries:
+            lines.append(f"<url><loc>{self.absolute(entry['url'])}</loc>"
+                         f"<lastmod>{entry['updated']}</lastmod></url>")
+        lines.append("</urlset>")
+        return "\n".join(lines) + "\n"
+
+    def sitemap_index(self, chunks):
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+                 '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">']
+        for number, chunk in enumerate(chunks, 1):
+            updated = max(entry["updated"] for entry in chunk)
+            lines.append(f"<sitemap><loc>{self.absolute(self.basepath + sitemap_chunk_name(number))}</loc>"
+                         f"<lastmod>{updated}</lastmod></sitemap>")
+        lines.append("</sitemapindex>")
+        return "\n".join(lines) + "\n"
+
+    def feed(self, entries):
+
+        """An Atom feed of the FEED_ENTRIES most recently changed pages"""
+
+        recent = heapq.nlargest(FEED_ENTRIES, entries, key=lambda entry: (entry["updated"], entry["url"]))
+        home = next((entry for entry in entries if entry["url"] == self.basepath + "index.html"), None)
+        title = home["title"] if home and home["title"] else self.site_url
+        updated = recent[0]["updated"] if recent else timestamp(0)
+        site = self.absolute(self.basepath)
+
+        lines = ['<?xml version="1.0" encoding="UTF-8"?>',
+                 '<feed xmlns="http://www.w3.org/2005/Atom">',
+                 f"<title>{escape(title)}</title>",
+                 f"<id>{site}</id>",
+                 f'<link href="{site}"/>',
+                 f'<link rel="self" href="{self.absolute(self.basepath + FEED_NAME)}"/>',
+                 f"<updated>{updated}</updated>",
+                 f"<author><name>{escape(self.author or title)}</name></author>"]
+        for entry in recent:
+            url = self.absolute(entry["url"])
+            lines.append(f"<entry><title>{escape(entry['title'] or entry['url'])}</title>"
+                         f'<link href="{url}"/><id>{url}</id><updated>{entry["updated"]}</updated></entry>')
+        lines.append("</feed>")
+        return "\n".join(lines) + "\n"
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"version": SITE_INDEX_VERSION, "site_url": self.site_url, "basepath": self.basepath,
+                       "author": self.author, "pages": self.pages, "outputs": self.outputs},
+                      f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
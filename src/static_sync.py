@@ -0,0 +1,138 @@
+import json
+import os
+import shutil
+
+from discovery import DEFAULT_IGNORE, scan_tree
+from postprocess import COMPRESSED_SUFFIXES
+
+
+def is_current(source_stat, dest_path):
+
+    """A destination is current when it has the source's size and mtime"""
+
+    try:
+        dest_stat = os.stat(dest_path)
+    except FileNotFoundError:
+        return False
+    return (dest_stat.st_size == source_stat.st_size
+            and dest_stat.st_mtime_ns == source_stat.st_mtime_ns)
+
+
+def place_file(source_path, dest_path, link=False):
+
+    """
+    Put source_path at dest_path, either as a hard link or as a copy.
+    shutil.copy2 already uses the kernel's zero-copy path where available.
+    """
+
+    if os.path.lexists(dest_path):
+        # Never write through an old hard link into another file
+        os.remove(dest_path)
+
+    if link:
+        try:
+            os.link(source_path, dest_path)
+            return
+        except OSError:
+            pass
+    shutil.copy2(source_path, dest_path)
+
+
+def remove_stale_siblings(source_path, dest_path):
+
+    """Remove precompressed siblings of a replaced file, unless they are static files themselves"""
+
+    for suffix in COMPRESSED_SUFFIXES:
+        if not os.path.exists(source_path + suffix):
+            try:
+                os.remove(dest_path + suffix)
+            except FileNotFoundError:
+                pass
+
+
+def transform_file(source_path, dest_path, transform):
+
+    """Write transform(text of source_path) to dest_path, keeping the source's mtime"""
+
+    with open(source_path, "r", encoding="utf-8") as f:
+        text = transform(f.read())
+    if os.path.lexists(dest_path):
+        os.remove(dest_path)
+    with open(dest_path, "w", encoding="utf-8") as f:
+        f.write(text)
+    shutil.copystat(source_path, dest_path)
+
+
+def load_record(record_path):
+    if record_path is None or not os.path.exists(record_path):
+        return {}
+    try:
+        with open(record_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_record(record_path, record):
+    directory = os.path.dirname(record_path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = record_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(record, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, record_path)
+
+
+def sync_tree(source_dir, dest_dir, record_path=None, link=False, transforms=None, ignore=DEFAULT_IGNORE):
+
+    """
+    Mirror the files of source_dir into dest_dir, copying only files whose
+    size or mtime differ and removing files synced by a previous run that
+    no longer exist in source_dir. Files in dest_dir that were never synced
+    (e.g. generated pages) are left alone. transforms maps lower-case file
+    extensions to text -> text functions (e.g. a CSS minifier) applied
+    instead of copying; those files are checked against the record, since
+    their size no longer matches the source. Files matching the ignore
+    patterns are skipped. Returns (copied, removed).
+    """
+
+    previous = load_record(record_path)
+    current = {}
+    copied = []
+
+    created = set()
+
+    # The scandir stat results are reused for the up-to-date checks
+    for entry in scan_tree(source_dir, ignore):
+        source_path, relative, source_stat = entry
+        dest_path = os.path.join(dest_dir, relative)
+        dest_root = os.path.dirname(dest_path)
+        if dest_root not in created:
+            os.makedirs(dest_root, exist_ok=True)
+            created.add(dest_root)
+        transform = transforms.get(os.path.splitext(relative)[1].lower()) if transforms else None
+
+        if transform is None:
+            current[relative] = [source_stat.st_size, source_stat.st_mtime_ns]
+            if not is_current(source_stat, dest_path):
+                place_file(source_path, dest_path, link)
+                remove_stale_siblings(source_path, dest_path)
+                copied.append(dest_path)
+        else:
+            current[relative] = [source_stat.st_size, source_stat.st_mtime_ns, "transformed"]
+            if previous.get(relative) != current[relative] or not os.path.exists(dest_path):
+                transform_file(source_path, dest_path, transform)
+                remove_stale_siblings(source_path, dest_path)
+                copied.append(dest_path)
+
+    removed = []
+    for relative in sorted(set(previous) - set(current)):
+        dest_path = os.path.join(dest_dir, relative)
+        if os.path.lexists(dest_path):
+            os.remove(dest_path)
+            removed.append(dest_path)
+
+    if record_path is not None:
+        save_record(record_path, current)
+
+    return copied, removed
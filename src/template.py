@@ -0,0 +1,201 @@
+import hashlib
+import os
+import re
+
+from htmlnode import resolve_url
+
+URL_ATTRIBUTE_PATTERN = re.compile(r'\b(href|src)="(/[^"]*)"')
+SLOT_PATTERN = re.compile(r"\{\{ (Title|Content) \}\}")
+PARTIAL_PATTERN = re.compile(r"\{\{> ([\w./-]+) \}\}")
+TEMPLATE_NAME = "template.html"
+PARTIALS_DIR = "partials"
+
+
+def partial_path(name, partials_dir):
+    return os.path.normpath(os.path.join(partials_dir, name + ".html"))
+
+
+def read_template(path, partials_dir, files=None, stack=()):
+
+    """
+    Read a template and replace every {{> name }} with partials_dir/name.html,
+    recursively. Returns the expanded text; files maps every path read
+    (the template first) to its contents.
+    """
+
+    if files is None:
+        files = {}
+    path = os.path.normpath(path)
+    if path in stack:
+        raise ValueError(f"partial include cycle: {' -> '.join(stack + (path,))}")
+
+    if path not in files:
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                files[path] = f.read()
+        except FileNotFoundError:
+            if stack:
+                raise ValueError(f"{stack[-1]}: partial {path} not found") from None
+            raise
+
+    def include(match):
+        return read_template(partial_path(match.group(1), partials_dir), partials_dir, files, stack + (path,))
+
+    return PARTIAL_PATTERN.sub(include, files[path])
+
+
+def rewrite_urls(html, basepath, assets=None):
+
+    """Resolve root-relative href/src attributes like htmlnode.resolve_url"""
+
+    if basepath == "/" and not assets:
+        return html
+
+    def rewrite(match):
+        return f'{match.group(1)}="{resolve_url(match.group(2), basepath, assets)}"'
+
+    return URL_ATTRIBUTE_PATTERN.sub(rewrite, html)
+
+
+class PageTemplate():
+
+    """
+    A page template compiled into static segments and named slots.
+    The basepath and asset fingerprints are applied to the static segments
+    once at compile time, so rendering a page is a single join of segments
+    and slot values.
+    dependencies lists the template file and every partial it includes, and
+    digest hashes their contents and the asset map, so pages can be rebuilt
+    when any of them changes.
+    """
+
+    def __init__(self, text, basepath="/", path=None, files=None, assets=None):
+        self.basepath = basepath
+        self.assets = assets
+        self.path = path
+        self.segments = []
+        self.slots = []
+
+        files = files or {path: text}
+        self.dependencies = [name for name in files if name is not None]
+        digest = hashlib.sha256()
+        for name, contents in files.items():
+            digest.update(f"{name}\0{contents}\0".encode("utf-8"))
+        for url, fingerprinted in sorted((assets or {}).items()):
+            digest.update(f"{url}\0{fingerprinted}\0".encode("utf-8"))
+        self.digest = digest.hexdigest()
+
+        position = 0
+        for match in SLOT_PATTERN.finditer(text):
+            self.segments.append(rewrite_urls(text[position:match.start()], basepath, assets))
+            self.slots.append(match.group(1))
+            position = match.end()
+        self.segments.append(rewrite_urls(text[position:], basepath, assets))
+
+    @classmethod
+    def load(cls, path, basepath="/", partials_dir=None, assets=None):
+        if partials_dir is None:
+            partials_dir = os.path.join(os.path.dirname(path), PARTIALS_DIR)
+        files = {}
+        text = read_template(path, partials_dir, files)
+        return cls(text, basepath, os.path.normpath(path), files, assets)
+
+    def render(self, **values):
+        parts = [self.segments[0]]
+        for slot, segment in zip(self.slots, self.segments[1:]):
+            parts.append(values.get(slot, ""))
+            parts.append(segment)
+        return "".join(parts)
+
+    def render_to(self, stream, **values):
+
+        """
+        Write the page into a file-like object. Slot values may be strings
+        or iterables of string chunks (e.g. HTMLNode.iter_html()).
+        """
+
+        stream.write(self.segments[0])
+        for slot, segment in zip(self.slots, self.segments[1:]):
+            value = values.get(slot, "")
+            if isinstance(value, str):
+                stream.write(value)
+            else:
+                for chunk in value:
+                    stream.write(chunk)
+            stream.write(segment)
+
+    def __repr__(self):
+        return f"PageTemplate({self.path}, {self.slots}, {self.basepath})"
+
+
+class TemplateLoader():
+
+    """
+    Picks the template for each page and compiles every template once.
+    A page uses the nearest template.html in its own content directory or a
+    parent directory up to content_dir, falling back to the site template.
+    Partials are looked up in the partials/ directory next to the site
+    template.
+    """
+
+    def __init__(self, site_template, content_dir, basepath="/", partials_dir=None, assets=None):
+        self.site_template = os.path.normpath(site_template)
+        self.content_dir = os.path.normpath(content_dir)
+        self.basepath = basepath
+        self.assets = assets
+        if partials_dir is None:
+            partials_dir = os.path.join(os.path.dirname(site_template), PARTIALS_DIR)
+        self.partials_dir = os.path.normpath(partials_dir)
+        self.templates = {}
+        self.directories = {}
+
+    def path_for(self, source):
+
+        """Return the path of the template that applies to a source file"""
+
+        directory = os.path.dirname(os.path.normpath(source))
+        visited = []
+        path = self.site_template
+        while True:
+            if directory in self.directories:
+                path = self.directories[directory]
+                break
+            visited.append(directory)
+            candidate = os.path.join(directory, TEMPLATE_NAME)
+            if os.path.isfile(candidate):
+                path = candidate
+                break
+            parent = os.path.dirname(directory)
+            if directory == self.content_dir or parent == directory or not directory:
+                break
+            directory = parent
+
+        for name in visited:
+            self.directories[name] = path
+        return path
+
+    def get(self, path):
+        path = os.path.normpath(path)
+        template = self.templates.get(path)
+        if template is None:
+            template = PageTemplate.load(path, self.basepath, self.partials_dir, self.assets)
+            self.templates[path] = template
+        return template
+
+    def template_for(self, source):
+        return self.get(self.path_for(source))
+
+    def is_template(self, path):
+
+        """True if path is the site template, a per-directory template or a partial"""
+
+        path = os.path.normpath(path)
+        if path == self.site_template:
+            return True
+        if os.path.basename(path) == TEMPLATE_NAME and in_directory(path, self.content_dir):
+            return True
+        return in_directory(path, self.partials_dir)
+
+
+def in_directory(path, directory):
+    return os.path.commonpath([os.path.abspath(path), os.path.abspath(directory)]) == os.path.abspath(directory)
@@ -0,0 +1,63 @@
+import os
+import unittest
+
+from assets import AssetManifest, fingerprinted_name
+from manifest import hash_file
+from test_support import TempDirTestCase
+
+
+class TestAssetManifest(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.static = os.path.join(self.root, "static")
+        self.dest = os.path.join(self.root, "public")
+        self.record = os.path.join(self.root, "assets.json")
+        self.css = self.write("index.css", "body {}")
+        self.write("images/a.png", "png-a")
+        self.write("robots.txt", "User-agent: *")
+
+    def write(self, relative, text):
+        super().write(os.path.join(self.static, relative), text)
+        return super().write(os.path.join(self.dest, relative), text)
+
+    def test_fingerprinted_name(self):
+        self.assertEqual(fingerprinted_name("css/site.css", "0123456789abcdef"), "css/site.0123456789.css")
+
+    def test_update_publishes_fingerprinted_copies(self):
+        written, removed = AssetManifest(self.record).update(self.static, self.dest)
+        css = os.path.join(self.dest, fingerprinted_name("index.css", hash_file(self.css)))
+        self.assertIn(css, written)
+        self.assertEqual(len(written), 2)
+        self.assertEqual(removed, [])
+        with open(css) as f:
+            self.assertEqual(f.read(), "body {}")
+
+        assets = AssetManifest(self.record)
+        self.assertEqual(assets.update(self.static, self.dest), ([], []))
+        self.assertEqual(assets.urls()["/index.css"], "/" + os.path.relpath(css, self.dest))
+        self.assertNotIn("/robots.txt", assets.urls())
+
+    def test_changed_asset_replaces_old_version(self):
+        assets = AssetManifest(self.record)
+        assets.update(self.static, self.dest)
+        old = os.path.join(self.dest, assets.entries["index.css"]["output"])
+        digest = assets.digest()
+
+        self.write("index.css", "body { color: red }")
+        written, removed = assets.update(self.static, self.dest)
+        self.assertEqual(removed, [old])
+        self.assertEqual(written, [os.path.join(self.dest, assets.entries["index.css"]["output"])])
+        self.assertNotEqual(assets.digest(), digest)
+
+    def test_ignored_assets_are_not_fingerprinted(self):
+        for relative in (".#index.css", "images/tom.png"):
+            path = os.path.join(self.static, relative)
+            with open(path, "w") as f:
+                f.write("not synced")
+        assets = AssetManifest(self.record)
+        assets.update(self.static, self.dest, ignore=(".#*", "tom.png"))
+        self.assertEqual(sorted(assets.entries), ["images/a.png".replace("/", os.sep), "index.css"])
+
+
+if __name__ == "__main__":
+    unittest.main()
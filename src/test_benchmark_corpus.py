@@ -0,0 +1,32 @@
+import os
+import tempfile
+import unittest
+
+from benchmarks.corpus import generate_corpus, parse_block_mix
+from markdown_to_blocks import extract_title, markdown_to_html_node
+
+
+class TestBenchmarkCorpus(unittest.TestCase):
+    def test_corpus_is_deterministic_and_parses(self):
+        with tempfile.TemporaryDirectory() as first, tempfile.TemporaryDirectory() as second:
+            pages = generate_corpus(first, pages=12, blocks_per_page=10, inline_density=0.5, depth=2, fanout=3)
+            generate_corpus(second, pages=12, blocks_per_page=10, inline_density=0.5, depth=2, fanout=3)
+            self.assertEqual(len(pages), 12)
+            self.assertTrue(os.path.exists(os.path.join(first, "template.html")))
+
+            for path in pages:
+                with open(path) as f:
+                    markdown = f.read()
+                with open(os.path.join(second, os.path.relpath(path, first))) as f:
+                    self.assertEqual(f.read(), markdown)
+                self.assertTrue(extract_title(markdown).startswith("Page "))
+                markdown_to_html_node(markdown).to_html()
+
+    def test_parse_block_mix(self):
+        self.assertEqual(parse_block_mix("paragraph=3,code=1"), {"paragraph": 3.0, "code": 1.0})
+        with self.assertRaises(ValueError):
+            parse_block_mix("table=1")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+from block_memo import BlockMemo
+from markdown_to_blocks import parse_document
+
+PAGE = """# Title
+
+Shared footer with a [link](/about) and ![logo](/logo.png)
+
+## Section
+
+- one
+- two
+"""
+
+
+class TestBlockMemo(unittest.TestCase):
+    def test_lru_eviction_and_counters(self):
+        memo = BlockMemo(max_entries=2)
+        memo.put("a", 1)
+        memo.put("b", 2)
+        self.assertEqual(memo.get("a"), 1)
+        memo.put("c", 3)
+        self.assertIsNone(memo.get("b"))
+        self.assertEqual(memo.get("c"), 3)
+        self.assertEqual(memo.stats(), {"hits": 2, "misses": 1, "entries": 2})
+
+    def test_memo_output_matches_plain_parse(self):
+        memo = BlockMemo()
+        plain = parse_document(PAGE)
+        first = parse_document(PAGE, memo=memo)
+        second = parse_document(PAGE, memo=memo)
+
+        self.assertEqual(memo.misses, 4)
+        self.assertEqual(memo.hits, 4)
+        for document in (first, second):
+            self.assertEqual(document.html_node.to_html(), plain.html_node.to_html())
+            self.assertEqual(document.metadata(), plain.metadata())
+
+    def test_title_comes_from_first_heading_across_memo_hits(self):
+        memo = BlockMemo()
+        parse_document("# Other\n\nbody", memo=memo)
+        document = parse_document("intro\n\n# Other\n\nbody", memo=memo)
+        self.assertEqual(document.title, "Other")
+        self.assertEqual(document.word_count, 3)
+
+    def test_errors_keep_line_numbers(self):
+        with self.assertRaises(ValueError) as ctx:
+            parse_document("fine\n\nthis **never closes", memo=BlockMemo())
+        self.assertIn("line 3", str(ctx.exception))
+
+
+if __name__ == "__main__":
+    unittest.main()
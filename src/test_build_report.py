@@ -0,0 +1,46 @@
+import json
+import os
+import tempfile
+import unittest
+
+from build_report import PHASES, BuildReport, PageTimer
+
+
+class TestPageTimer(unittest.TestCase):
+    def test_timed_adds_to_phase(self):
+        timer = PageTimer()
+        wrapped = timer.timed("inline", lambda text: text.upper())
+        self.assertEqual(wrapped("a"), "A")
+        self.assertGreater(timer.phases["inline"], 0)
+        self.assertEqual(set(timer.phases), set(PHASES))
+
+    def test_timed_chunks_passes_chunks_through(self):
+        timer = PageTimer()
+        self.assertEqual(list(timer.timed_chunks("render", ["<p>", "x", "</p>"])), ["<p>", "x", "</p>"])
+        self.assertGreater(timer.phases["render"], 0)
+
+
+class TestBuildReport(unittest.TestCase):
+    def test_summary_and_write(self):
+        report = BuildReport()
+        report.add_page("a.md", dict(dict.fromkeys(PHASES, 0.0), read=0.5))
+        report.add_page("b.md", dict(dict.fromkeys(PHASES, 0.0), render=2.0))
+        report.skipped = 3
+        report.set_static(4, 1, 0.25)
+        report.finish()
+
+        summary = report.summary(slowest=1)
+        self.assertEqual(summary["pages"], {"built": 2, "skipped": 3, "removed": 0})
+        self.assertEqual(summary["phases"]["read"], 0.5)
+        self.assertEqual([page["source"] for page in summary["slowest"]], ["b.md"])
+        self.assertEqual(summary["static"]["copied"], 4)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache", "report.json")
+            report.write(path)
+            with open(path) as f:
+                self.assertEqual(json.load(f)["pages"]["built"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,159 @@
+import os
+import threading
+import unittest
+import urllib.request
+from functools import partial
+from http.server import ThreadingHTTPServer
+
+from dev_server import (LiveReloadHandler, ReloadNotifier, SiteWatcher, RELOAD_SCRIPT,
+                        diff_snapshots, inject_reload_script)
+from assets import AssetManifest
+from main import generate_pages_recursive
+from manifest import BuildManifest
+from static_sync import sync_tree
+from test_support import TempDirTestCase
+
+
+class TestDevServer(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.root, "content")
+        self.static = os.path.join(self.root, "static")
+        self.dest = os.path.join(self.root, "public")
+        self.template = os.path.join(self.root, "template.html")
+        self.write(self.template, "<body>{{ Content }}</body>")
+        self.write(os.path.join(self.content, "index.md"), "# Home")
+        self.write(os.path.join(self.content, "blog", "index.md"), "# Blog")
+        self.write(os.path.join(self.static, "index.css"), "body {}")
+
+        self.manifest = BuildManifest(os.path.join(self.root, "manifest.json"))
+        generate_pages_recursive(self.content, self.template, self.dest, "/", self.manifest)
+        self.watcher = SiteWatcher(self.content, self.static, self.template, self.dest, "/",
+                                   self.manifest, os.path.join(self.root, "static.json"))
+
+    def read(self, *parts):
+        with open(os.path.join(self.dest, *parts)) as f:
+            return f.read()
+
+    def test_diff_snapshots(self):
+        changed, removed = diff_snapshots({"a": 1, "b": 2}, {"a": 1, "b": 3, "c": 4})
+        self.assertEqual(changed, {"b", "c"})
+        self.assertEqual(removed, set())
+        self.assertEqual(diff_snapshots({"a": 1}, {}), (set(), {"a"}))
+
+    def test_inject_reload_script(self):
+        self.assertEqual(inject_reload_script("<body>x</body>"), f"<body>x{RELOAD_SCRIPT}</body>")
+        self.assertEqual(inject_reload_script("x"), "x" + RELOAD_SCRIPT)
+
+    def test_changed_page_rebuilt_alone(self):
+        self.write(os.path.join(self.dest, "index.html"), "untouched")
+        blog = os.path.join(self.content, "blog", "index.md")
+        self.write(blog, "# Blog edited")
+
+        self.watcher.apply({blog}, set())
+        self.assertIn("Blog edited", self.read("blog", "index.html"))
+        self.assertEqual(self.read("index.html"), "untouched")
+
+    def test_removed_page_and_static_change(self):
+        blog = os.path.join(self.content, "blog", "index.md")
+        os.remove(blog)
+        css = os.path.join(self.static, "index.css")
+
+        self.watcher.apply({css}, {blog})
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "blog", "index.html")))
+        self.assertEqual(self.read("index.css"), "body {}")
+
+    def test_ignored_files_are_not_published(self):
+        watcher = SiteWatcher(self.content, self.static, self.template, self.dest, "/",
+                              self.manifest, os.path.join(self.root, "static.json"), ignore=("drafts", "*.psd"))
+        self.write(os.path.join(self.content, "drafts", "index.md"), "# Draft")
+        self.write(os.path.join(self.static, "logo.psd"), "layers")
+        self.write(os.path.join(self.static, "site.css"), "p {}")
+        self.assertTrue(watcher.poll())
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "drafts")))
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "logo.psd")))
+        self.assertEqual(self.read("site.css"), "p {}")
+
+    def test_minify_applies_to_rebuilt_pages_and_css(self):
+        watcher = SiteWatcher(self.content, self.static, self.template, self.dest, "/",
+                              self.manifest, os.path.join(self.root, "static.json"), minify=True)
+        blog = os.path.join(self.content, "blog", "index.md")
+        css = os.path.join(self.static, "index.css")
+        self.write(blog, "# Blog\n\n<!-- -->   spaced    out")
+        self.write(css, "body {\n  color: red;\n}")
+        watcher.apply({blog, css}, set())
+        self.assertEqual(self.read("blog", "index.html"), "<body><div><h1>Blog</h1><p>spaced out</p></div></body>")
+        self.assertEqual(self.read("index.css"), "body{color:red}")
+        self.assertTrue(self.manifest.entries[blog]["template_hash"].endswith(":minify"))
+
+    def test_fingerprinted_assets(self):
+        self.write(self.template, '<link href="/index.css"><body>{{ Content }}</body>')
+        sync_tree(self.static, self.dest)
+        assets = AssetManifest(os.path.join(self.root, "assets.json"))
+        assets.update(self.static, self.dest)
+        generate_pages_recursive(self.content, self.template, self.dest, "/", self.manifest, assets=assets.urls())
+        watcher = SiteWatcher(self.content, self.static, self.template, self.dest, "/",
+                              self.manifest, os.path.join(self.root, "static.json"), asset_manifest=assets)
+        old = assets.urls()["/index.css"]
+
+        blog = os.path.join(self.content, "blog", "index.md")
+        self.write(blog, "# Blog edited")
+        watcher.apply({blog}, set())
+        self.assertIn(f'<link href="{old}">', self.read("blog", "index.html"))
+
+        css = os.path.join(self.static, "index.css")
+        self.write(css, "body { color: red }")
+        watcher.apply({css}, set())
+        new = assets.urls()["/index.css"]
+        self.assertNotEqual(new, old)
+        self.assertIn(f'<link href="{new}">', self.read("index.html"))
+        self.assertIn(f'<link href="{new}">', self.read("blog", "index.html"))
+
+    def test_template_change_rebuilds_everything(self):
+        self.write(self.template, "<main>{{ Content }}</main>")
+        self.watcher.apply({self.template}, set())
+        self.assertTrue(self.read("index.html").startswith("<main>"))
+        self.assertTrue(self.read("blog", "index.html").startswith("<main>"))
+
+    def test_partial_change_rebuilds_dependents(self):
+        self.write(os.path.join(self.root, "partials", "footer.html"), "<footer>one</footer>")
+        blog_template = os.path.join(self.content, "blog", "template.html")
+        self.write(blog_template, "<blog>{{ Content }}{{> footer }}</blog>")
+        self.watcher.apply({blog_template, os.path.join(self.root, "partials", "footer.html")}, set())
+        self.assertTrue(self.read("blog", "index.html").startswith("<blog>"))
+
+        self.write(os.path.join(self.dest, "index.html"), "untouched")
+        self.write(os.path.join(self.root, "partials", "footer.html"), "<footer>two</footer>")
+        self.watcher.apply({os.path.join(self.root, "partials", "footer.html")}, set())
+        self.assertIn("<footer>two</footer>", self.read("blog", "index.html"))
+        self.assertEqual(self.read("index.html"), "untouched")
+
+        os.remove(blog_template)
+        self.watcher.apply(set(), {blog_template})
+        self.assertEqual(self.read("blog", "index.html"), "<body><div><h1>Blog</h1></div></body>")
+
+    def test_notifier_wait(self):
+        notifier = ReloadNotifier()
+        self.assertEqual(notifier.wait(0, timeout=0), 0)
+        notifier.notify()
+        self.assertEqual(notifier.wait(0, timeout=0), 1)
+
+    def test_handler_injects_script(self):
+        class QuietHandler(LiveReloadHandler):
+            def log_message(self, *args):
+                pass
+
+        handler = partial(QuietHandler, directory=self.dest, notifier=ReloadNotifier())
+        server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/blog/"
+            with urllib.request.urlopen(url) as response:
+                self.assertIn(RELOAD_SCRIPT, response.read().decode())
+        finally:
+            server.shutdown()
+            server.server_close()
+
+
+if __name__ == "__main__":
+    unittest.main()
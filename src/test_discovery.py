@@ -0,0 +1,69 @@
+import os
+import sys
+import unittest
+
+from discovery import DEFAULT_IGNORE, scan_tree
+from test_support import TempDirTestCase
+
+
+class TestScanTree(TempDirTestCase):
+    def relatives(self, ignore=DEFAULT_IGNORE):
+        return [entry.relative for entry in scan_tree(self.root, ignore)]
+
+    def test_depth_first_in_name_order(self):
+        for relative in ["b.md", "a/z.md", "a/b/c.md", "c.md", "a.md"]:
+            self.write(relative)
+        self.assertEqual(self.relatives(), [
+            os.path.join("a", "b", "c.md"),
+            os.path.join("a", "z.md"),
+            "a.md",
+            "b.md",
+            "c.md",
+        ])
+
+    def test_entries_carry_stat(self):
+        path = self.write("index.md", "hello")
+        entry, = scan_tree(self.root)
+        self.assertEqual(entry.path, path)
+        self.assertEqual(entry.stat.st_size, 5)
+        self.assertEqual(entry.stat.st_mtime_ns, os.stat(path).st_mtime_ns)
+
+    def test_ignore_patterns(self):
+        self.write("index.md")
+        self.write("index.md~")
+        self.write("drafts/post.md")
+        self.write("blog/drafts/post.md")
+        self.write("blog/post.md")
+        self.assertEqual(self.relatives(DEFAULT_IGNORE + ("drafts",)),
+                         ["blog/post.md".replace("/", os.sep), "index.md"])
+        self.assertEqual(self.relatives(("blog/drafts",)), [
+            os.path.join("blog", "post.md"),
+            os.path.join("drafts", "post.md"),
+            "index.md",
+            "index.md~",
+        ])
+
+    def test_deep_tree_does_not_recurse(self):
+        path = self.root
+        for _ in range(200):
+            path = os.path.join(path, "d")
+            os.mkdir(path)
+        with open(os.path.join(path, "leaf.md"), "w") as f:
+            f.write("x")
+        limit = sys.getrecursionlimit()
+        sys.setrecursionlimit(100)
+        try:
+            entry, = scan_tree(self.root)
+        finally:
+            sys.setrecursionlimit(limit)
+        self.assertTrue(entry.relative.endswith("leaf.md"))
+
+    def test_is_lazy(self):
+        self.write("a.md")
+        entries = scan_tree(self.root)
+        self.write("b.md")
+        self.assertEqual([entry.relative for entry in entries], ["a.md", "b.md"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import os
+import unittest
+
+from doc_cache import DocumentCache, parser_version
+from markdown_to_blocks import parse_document
+from test_support import TempDirTestCase
+
+
+class TestDocumentCache(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache = DocumentCache(os.path.join(self.root, "documents"))
+
+    def test_round_trip(self):
+        document = parse_document("# Title\n\nSome [link](/a) and **bold**")
+        self.assertIsNone(self.cache.get("abc"))
+        self.cache.put("abc", document)
+
+        cached = self.cache.get("abc")
+        self.assertEqual(cached.html_node.to_html(), document.html_node.to_html())
+        self.assertEqual(cached.metadata(), document.metadata())
+
+    def test_parser_version_is_part_of_the_key(self):
+        self.assertEqual(self.cache.version, parser_version())
+        self.cache.put("abc", parse_document("text"))
+        other = DocumentCache(self.cache.directory, version="other-parser")
+        self.assertIsNone(other.get("abc"))
+
+    def test_corrupt_entry_is_a_miss(self):
+        path = self.cache.path_for("abc")
+        os.makedirs(os.path.dirname(path))
+        with open(path, "wb") as f:
+            f.write(b"not a pickle")
+        self.assertIsNone(self.cache.get("abc"))
+        self.assertFalse(os.path.exists(path))
+
+    def test_variant_is_part_of_the_key(self):
+        site = DocumentCache(self.cache.directory, variant="/site/")
+        site.put("abc", parse_document("[a](/a)", basepath="/site/"))
+        self.assertIsNone(self.cache.get("abc"))
+        self.assertIn('href="/site/a"', site.get("abc").html_node.to_html())
+
+    def test_prune_evicts_least_recently_used(self):
+        for index, key in enumerate(["old", "used", "new"]):
+            self.cache.put(key, parse_document("word " * 50))
+            os.utime(self.cache.path_for(key), ns=(index * 10**9, index * 10**9))
+        self.cache.get("used")
+
+        size = os.path.getsize(self.cache.path_for("new"))
+        self.cache.max_bytes = size * 2
+        self.assertEqual(self.cache.prune(), 1)
+        self.assertFalse(os.path.exists(self.cache.path_for("old")))
+        self.assertIsNotNone(self.cache.get("used"))
+        self.assertIsNotNone(self.cache.get("new"))
+
+
+if __name__ == "__main__":
+    unittest.main()
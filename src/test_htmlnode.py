@@ -1,6 +1,8 @@
+import io
+import pickle
 import unittest
 
-from htmlnode import HTMLNode, LeafNode, ParentNode, text_node_to_html_node
+from htmlnode import HTMLNode, LeafNode, ParentNode, text_node_to_html_node, EMPTY_PROPS
 from textnode import TextNode, TextType
 
 class TestHTMLNode(unittest.TestCase):
@@ -87,3 +89,73 @@ class TestHTMLNode(unittest.TestCase):
         self.assertEqual(html_node.tag, "img")
         self.assertNotEqual(html_node.value, "WhiteBeards Image")
 
+    def test_basepath_resolved_on_links_and_images(self):
+        link = text_node_to_html_node(TextNode("docs", TextType.LINK, "/docs"), "/site/")
+        image = text_node_to_html_node(TextNode("map", TextType.IMAGE, "/map.png"), "/site/")
+        self.assertEqual(link.to_html(), '<a href="/site/docs">docs</a>')
+        self.assertEqual(image.props["src"], "/site/map.png")
+
+    def test_basepath_leaves_other_urls(self):
+        for url in ("https://example.com/", "//cdn.example.com/x.js", "./local.png", "#top"):
+            node = text_node_to_html_node(TextNode("x", TextType.LINK, url), "/site/")
+            self.assertEqual(node.props["href"], url)
+
+    def test_assets_map_fingerprinted_urls(self):
+        assets = {"/images/a.png": "/images/a.0123456789.png"}
+        image = text_node_to_html_node(TextNode("a", TextType.IMAGE, "/images/a.png"), "/site/", assets)
+        self.assertEqual(image.props["src"], "/site/images/a.0123456789.png")
+        other = text_node_to_html_node(TextNode("b", TextType.IMAGE, "images/a.png"), "/site/", assets)
+        self.assertEqual(other.props["src"], "images/a.png")
+
+    def test_iter_html_matches_to_html(self):
+        node = ParentNode("div", [
+            ParentNode("p", [LeafNode("b", "bold"), LeafNode(None, " text")], {"class": "intro"}),
+            LeafNode("a", "link", {"href": "/x"}),
+        ])
+        self.assertEqual(
+            "".join(node.iter_html()),
+            '<div><p class="intro"><b>bold</b> text</p><a href="/x">link</a></div>',
+        )
+
+    def test_render_to_stream(self):
+        node = ParentNode("ul", [ParentNode("li", [LeafNode(None, str(i))]) for i in range(3)])
+        stream = io.StringIO()
+        node.render_to(stream)
+        self.assertEqual(stream.getvalue(), "<ul><li>0</li><li>1</li><li>2</li></ul>")
+
+    def test_deep_tree_does_not_recurse(self):
+        node = LeafNode(None, "deep")
+        for _ in range(5000):
+            node = ParentNode("span", [node])
+        html = node.to_html()
+        self.assertTrue(html.startswith("<span><span>"))
+        self.assertEqual(len(html), 5000 * len("<span></span>") + len("deep"))
+
+    def test_parent_errors_while_streaming(self):
+        with self.assertRaises(ValueError):
+            ParentNode("div", [ParentNode(None, [])]).to_html()
+        with self.assertRaises(ValueError):
+            ParentNode("div", [ParentNode("p", None)]).to_html()
+        with self.assertRaises(ValueError):
+            ParentNode("div", [LeafNode("p", None)]).to_html()
+
+    def test_empty_props_shared_and_read_only(self):
+        node = LeafNode("p", "a")
+        self.assertIs(node.props, EMPTY_PROPS)
+        self.assertIs(ParentNode("div", []).props, EMPTY_PROPS)
+        self.assertEqual(node.props_to_html(), "")
+        self.assertEqual(repr(node), "LeafNode(p, a, None)")
+        with self.assertRaises(TypeError):
+            node.props["class"] = "x"
+        with self.assertRaises(TypeError):
+            node.props |= {"class": "x"}
+        self.assertEqual(EMPTY_PROPS, {})
+
+    def test_nodes_are_slotted_and_picklable(self):
+        node = ParentNode("p", [LeafNode("a", "x", {"href": "/"}), LeafNode(None, "y")])
+        with self.assertRaises(AttributeError):
+            node.extra = 1
+        copy = pickle.loads(pickle.dumps(node))
+        self.assertEqual(copy, node)
+        self.assertIs(copy.children[1].props, EMPTY_PROPS)
+        self.assertEqual(copy.to_html(), '<p><a href="/">x</a>y</p>')
@@ -229,6 +229,22 @@ class TestInlineMarkdown(unittest.TestCase):
             new_nodes,
         )
 
+    def test_split_links_after_identical_image(self):
+        node = TextNode("![a](b) and [a](b)", TextType.TEXT)
+        self.assertListEqual(
+            [
+                TextNode("![a](b) and ", TextType.TEXT),
+                TextNode("a", TextType.LINK, "b"),
+            ],
+            split_nodes_link([node]),
+        )
+
+    def test_split_many_links(self):
+        text = " ".join(f"[{i}](/{i}.html)" for i in range(5000))
+        nodes = split_nodes_link([TextNode(text, TextType.TEXT)])
+        self.assertEqual(len(nodes), 9999)
+        self.assertEqual(nodes[-1], TextNode("4999", TextType.LINK, "/4999.html"))
+
     def test_text_to_textnodes_basic(self):
         node = TextNode(
             "This is **bold** and *italic* text with `code`",
@@ -288,5 +304,55 @@ class TestInlineMarkdown(unittest.TestCase):
         new_nodes = text_to_textnodes(node)
         self.assertListEqual([], new_nodes)
 
+    def test_text_to_textnodes_matches_split_passes(self):
+        samples = [
+            "plain text only",
+            "**bold** at the start and _italic_ at the end",
+            "`code` then **bold** then [a](b) then ![c](d) and more",
+            "![img](x.png)[link](y.html)**b**_i_`c`",
+            "not a [link] nor an ![image] (here)",
+            "**a**_b_`c`",
+            "See note [1] and ![logo](/logo.png) here",
+            "[![badge](b.svg)](https://ci.dev) then [c](d)",
+        ]
+        for sample in samples:
+            with self.subTest(sample=sample):
+                nodes = split_nodes_delimiter([TextNode(sample, TextType.TEXT)], "**", TextType.BOLD)
+                nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
+                nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
+                nodes = split_nodes_link(split_nodes_image(nodes))
+                self.assertListEqual(nodes, text_to_textnodes(sample))
+
+    def test_text_to_textnodes_image_inside_link_span(self):
+        self.assertListEqual(
+            [
+                TextNode("See note [1] and ", TextType.TEXT),
+                TextNode("logo", TextType.IMAGE, "/logo.png"),
+                TextNode(" here", TextType.TEXT),
+            ],
+            text_to_textnodes("See note [1] and ![logo](/logo.png) here"),
+        )
+
+    def test_text_to_textnodes_literal_spans(self):
+        self.assertListEqual(
+            [
+                TextNode("see ", TextType.TEXT),
+                TextNode("snake_case_name", TextType.CODE),
+                TextNode(" at ", TextType.TEXT),
+                TextNode("docs", TextType.LINK, "https://a.dev/x_y_z"),
+            ],
+            text_to_textnodes("see `snake_case_name` at [docs](https://a.dev/x_y_z)"),
+        )
+
+    def test_text_to_textnodes_unclosed(self):
+        for text in ["an **unclosed bold", "a `dangling code", "one _ underscore"]:
+            with self.subTest(text=text):
+                with self.assertRaises(ValueError):
+                    text_to_textnodes(text)
+
+    def test_text_to_textnodes_non_text_node(self):
+        node = TextNode("**kept**", TextType.CODE)
+        self.assertListEqual([node], text_to_textnodes(node))
+
 if __name__ == "__main__":
     unittest.main()
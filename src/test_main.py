@@ -0,0 +1,187 @@
+import json
+import os
+import unittest
+from unittest import mock
+
+import main
+from main import PageJob, discover_pages, generate_pages_recursive, read_page, render_job, write_page
+from build_report import BuildReport
+from manifest import BuildManifest
+from template import PageTemplate
+from search_index import INDEX_NAME, SearchIndex, shard_name
+from test_support import TempDirTestCase
+
+TEMPLATE = '<title>{{ Title }}</title><link href="/index.css"><article>{{ Content }}</article>'
+
+
+class TestGeneratePages(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.root, "content")
+        self.template = os.path.join(self.root, "template.html")
+        super().write(self.template, TEMPLATE)
+        self.write("index.md", "# Home\n\nWelcome **home**")
+        self.write("blog/b/index.md", "# B\n\nSecond post")
+        self.write("blog/a/index.md", "# A\n\nFirst post")
+        self.write("blog/notes.txt", "not markdown")
+
+    def write(self, relative, text):
+        return super().write(os.path.join(self.content, relative), text)
+
+    def read_outputs(self, dest):
+        outputs = {}
+        for source, html in discover_pages(self.content, dest):
+            with open(html) as f:
+                outputs[os.path.relpath(html, dest)] = f.read()
+        return outputs
+
+    def test_discover_pages_sorted(self):
+        pages = discover_pages(self.content, "public")
+        self.assertEqual(
+            [os.path.relpath(source, self.content) for source, _ in pages],
+            ["blog/a/index.md", "blog/b/index.md", "index.md"],
+        )
+        self.assertEqual(pages[-1][1], os.path.join("public", "index.html"))
+
+    def test_parallel_matches_serial(self):
+        serial = os.path.join(self.root, "serial")
+        parallel = os.path.join(self.root, "parallel")
+        generate_pages_recursive(self.content, self.template, serial, "/site/", workers=1)
+        generate_pages_recursive(self.content, self.template, parallel, "/site/", workers=2)
+        self.assertEqual(self.read_outputs(serial), self.read_outputs(parallel))
+        self.assertIn('<link href="/site/index.css">', self.read_outputs(serial)["index.html"])
+
+    def test_pool_is_no_larger_than_the_page_count(self):
+        dest = os.path.join(self.root, "out")
+        with mock.patch.object(main, "ProcessPoolExecutor", wraps=main.ProcessPoolExecutor) as pool:
+            generate_pages_recursive(self.content, self.template, dest, "/", workers=8)
+        self.assertEqual(pool.call_args.kwargs["max_workers"], 3)
+
+    def test_block_memo_matches_plain_build(self):
+        self.write("blog/c/index.md", "# C\n\nWelcome **home**")
+        plain = os.path.join(self.root, "plain")
+        memoised = os.path.join(self.root, "memoised")
+        report = BuildReport()
+        generate_pages_recursive(self.content, self.template, plain, "/site/")
+        generate_pages_recursive(self.content, self.template, memoised, "/site/", report=report, memo_entries=64)
+        self.assertEqual(self.read_outputs(plain), self.read_outputs(memoised))
+        self.assertEqual(report.counters, {"memo_hits": 1, "memo_misses": 7})
+
+    def test_directory_templates_and_partials(self):
+        dest = os.path.join(self.root, "public")
+        with open(self.template, "w") as f:
+            f.write("{{> nav }}" + TEMPLATE)
+        partials = os.path.join(self.root, "partials")
+        os.makedirs(partials)
+        with open(os.path.join(partials, "nav.html"), "w") as f:
+            f.write("<nav>site</nav>")
+        self.write("blog/template.html", "<blog>{{ Content }}</blog>")
+
+        manifest = BuildManifest(os.path.join(self.root, "manifest.json"))
+        generate_pages_recursive(self.content, self.template, dest, "/", manifest)
+        outputs = self.read_outputs(dest)
+        self.assertTrue(outputs["index.html"].startswith("<nav>site</nav><title>Home</title>"))
+        self.assertTrue(outputs[os.path.join("blog", "a", "index.html")].startswith("<blog><div><h1>A</h1>"))
+
+        # Editing the partial rebuilds only the pages that include it
+        blog_page = os.path.join(dest, "blog", "a", "index.html")
+        with open(blog_page, "w") as f:
+            f.write("untouched")
+        with open(os.path.join(partials, "nav.html"), "w") as f:
+            f.write("<nav>edited</nav>")
+        generate_pages_recursive(self.content, self.template, dest, "/", manifest)
+        self.assertIn("<nav>edited</nav>", self.read_outputs(dest)["index.html"])
+        with open(blog_page) as f:
+            self.assertEqual(f.read(), "untouched")
+
+    def test_assets_rewrite_template_and_page_references(self):
+        self.write("blog/a/index.md", "# A\n\n![logo](/logo.png)")
+        dest = os.path.join(self.root, "public")
+        assets = {"/index.css": "/index.0123456789.css", "/logo.png": "/logo.abcdef0123.png"}
+        generate_pages_recursive(self.content, self.template, dest, "/site/", assets=assets)
+        page = self.read_outputs(dest)[os.path.join("blog", "a", "index.html")]
+        self.assertIn('<link href="/site/index.0123456789.css">', page)
+        self.assertIn('src="/site/logo.abcdef0123.png"', page)
+
+    def test_error_names_source(self):
+        self.write("broken.md", "this **never closes")
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                with self.assertRaises(RuntimeError) as ctx:
+                    generate_pages_recursive(self.content, self.template,
+                                             os.path.join(self.root, "out"), "/", workers=workers)
+                self.assertIn("broken.md", str(ctx.exception))
+
+    def test_manifest_skips_unchanged(self):
+        dest = os.path.join(self.root, "public")
+        manifest = BuildManifest(os.path.join(self.root, "manifest.json"))
+        generate_pages_recursive(self.content, self.template, dest, "/", manifest)
+        index = os.path.join(dest, "index.html")
+        with open(index, "w") as f:
+            f.write("untouched")
+
+        self.write("blog/a/index.md", "# A\n\nEdited")
+        generate_pages_recursive(self.content, self.template, dest, "/", manifest)
+        with open(index) as f:
+            self.assertEqual(f.read(), "untouched")
+        self.assertIn("Edited", self.read_outputs(dest)[os.path.join("blog", "a", "index.html")])
+
+    def test_serial_render_streams_into_the_output(self):
+        dest = os.path.join(self.root, "out", "index.html")
+        job = PageJob(os.path.join(self.content, "index.md"), dest)
+        render_job(read_page(job), PageTemplate(TEMPLATE), stream=True)
+        self.assertIsNone(job.html)
+        write_page(job)
+        with open(dest) as f:
+            self.assertEqual(f.read(), '<title>Home</title><link href="/index.css"><article><div><h1>Home</h1>'
+                                       '<p>Welcome <b>home</b></p></div></article>')
+
+    def test_rewritten_pages_drop_precompressed_siblings(self):
+        dest = os.path.join(self.root, "public")
+        stale = os.path.join(dest, "index.html.gz")
+        os.makedirs(dest)
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                with open(stale, "w") as f:
+                    f.write("old page")
+                generate_pages_recursive(self.content, self.template, dest, "/", workers=workers)
+                self.assertFalse(os.path.exists(stale))
+
+    def test_search_index_is_updated_incrementally(self):
+        dest = os.path.join(self.root, "public")
+        search_dir = os.path.join(dest, "search")
+        state = os.path.join(self.root, "search.json")
+        manifest = BuildManifest(os.path.join(self.root, "manifest.json"))
+        search = SearchIndex(state, search_dir)
+        generate_pages_recursive(self.content, self.template, dest, "/site/", manifest, workers=2, search=search)
+        search.write()
+        with open(os.path.join(search_dir, INDEX_NAME)) as f:
+            self.assertEqual(json.load(f)["pages"], [["/site/blog/a/index.html", "A"],
+                                                      ["/site/blog/b/index.html", "B"],
+                                                      ["/site/index.html", "Home"]])
+        with open(os.path.join(search_dir, shard_name("po"))) as f:
+            self.assertEqual(json.load(f), {"post": [0, 1, 1, 1]})
+
+        self.write("blog/a/index.md", "# A\n\nEdited")
+        report = BuildReport()
+        search = SearchIndex(state, search_dir)
+        generate_pages_recursive(self.content, self.template, dest, "/site/", manifest, report=report,
+                                 search=search)
+        search.write()
+        self.assertEqual(len(report.pages), 1)
+        with open(os.path.join(search_dir, shard_name("po"))) as f:
+            self.assertEqual(json.load(f), {"post": [1, 1]})
+
+        # A template change rebuilds every page but leaves the index alone
+        super().write(self.template, TEMPLATE + "<footer></footer>")
+        report = BuildReport()
+        search = SearchIndex(state, search_dir)
+        generate_pages_recursive(self.content, self.template, dest, "/site/", manifest, report=report,
+                                 search=search)
+        self.assertEqual(len(report.pages), 3)
+        self.assertEqual(search.changed, {})
+        self.assertEqual(search.write(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import os
+import unittest
+from unittest import mock
+
+import manifest as manifest_module
+from manifest import BuildManifest, hash_file
+from test_support import TempDirTestCase
+
+
+class TestBuildManifest(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.path = os.path.join(self.root, "cache", "manifest.json")
+        self.output = os.path.join(self.root, "index.html")
+        with open(self.output, "w") as f:
+            f.write("<p>hi</p>")
+
+    def test_new_source_needs_build(self):
+        manifest = BuildManifest(self.path)
+        self.assertTrue(manifest.needs_build("a.md", "h1", "t1", "/", self.output))
+
+    def test_unchanged_source_is_skipped_after_save(self):
+        manifest = BuildManifest(self.path)
+        manifest.record("a.md", "h1", "t1", "/", self.output)
+        manifest.save()
+
+        reloaded = BuildManifest(self.path)
+        self.assertFalse(reloaded.needs_build("a.md", "h1", "t1", "/", self.output))
+
+    def test_changes_invalidate(self):
+        manifest = BuildManifest(self.path)
+        manifest.record("a.md", "h1", "t1", "/", self.output)
+        self.assertTrue(manifest.needs_build("a.md", "h2", "t1", "/", self.output))
+        self.assertTrue(manifest.needs_build("a.md", "h1", "t2", "/", self.output))
+        self.assertTrue(manifest.needs_build("a.md", "h1", "t1", "/site/", self.output))
+
+    def test_generator_change_invalidates(self):
+        manifest = BuildManifest(self.path)
+        manifest.record("a.md", "h1", "t1", "/", self.output)
+        with mock.patch.object(manifest_module, "_generator_version", "fixed renderer"):
+            self.assertTrue(manifest.needs_build("a.md", "h1", "t1", "/", self.output))
+
+    def test_missing_output_needs_build(self):
+        manifest = BuildManifest(self.path)
+        manifest.record("a.md", "h1", "t1", "/", self.output)
+        os.remove(self.output)
+        self.assertTrue(manifest.needs_build("a.md", "h1", "t1", "/", self.output))
+
+    def test_remove_stale_deletes_outputs(self):
+        manifest = BuildManifest(self.path)
+        manifest.record("a.md", "h1", "t1", "/", self.output)
+        manifest.save()
+
+        reloaded = BuildManifest(self.path)
+        self.assertEqual(reloaded.remove_stale(), [self.output])
+        self.assertFalse(os.path.exists(self.output))
+        self.assertEqual(reloaded.entries, {})
+
+    def test_dependents(self):
+        manifest = BuildManifest(self.path)
+        manifest.record("a.md", "h", "t", "/", self.output, ["template.html", "partials/nav.html"])
+        manifest.record("b.md", "h", "t", "/", self.output, ["blog/template.html"])
+        self.assertEqual(manifest.dependents({"partials/nav.html"}), ["a.md"])
+        self.assertEqual(manifest.dependents({"template.html", "blog/template.html"}), ["a.md", "b.md"])
+        self.assertEqual(manifest.dependencies(), {"template.html", "partials/nav.html", "blog/template.html"})
+
+    def test_source_hash_reuses_recorded_hash_for_unchanged_stat(self):
+        source = os.path.join(self.root, "a.md")
+        with open(source, "w") as f:
+            f.write("# a")
+        manifest = BuildManifest(self.path)
+        source_hash = manifest.source_hash(source)
+        self.assertEqual(source_hash, hash_file(source))
+        manifest.record(source, "recorded", "t", "/", self.output)
+        manifest.save()
+
+        reloaded = BuildManifest(self.path)
+        self.assertEqual(reloaded.source_hash(source), "recorded")
+        with open(source, "w") as f:
+            f.write("# changed")
+        self.assertEqual(reloaded.source_hash(source), hash_file(source))
+
+    def test_corrupt_manifest_is_ignored(self):
+        os.makedirs(os.path.dirname(self.path))
+        with open(self.path, "w") as f:
+            f.write("{not json")
+        self.assertEqual(BuildManifest(self.path).entries, {})
+
+    def test_hash_file(self):
+        self.assertEqual(hash_file(self.output), hash_file(self.output))
+        self.assertEqual(len(hash_file(self.output)), 64)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,5 +1,6 @@
+import io
 import unittest
-from markdown_to_blocks import markdown_to_blocks, block_to_block_type, BlockType, markdown_to_html_node, extract_title
+from markdown_to_blocks import markdown_to_blocks, block_to_block_type, BlockType, markdown_to_html_node, extract_title, iter_blocks, classify_block, extract_text_content, parse_document, HEADING_WEIGHT
 
 class TestMarkdownBlocks(unittest.TestCase):
 
@@ -172,6 +173,69 @@ Some text
         md = "## Not a main title\n\n# Main Title"
         self.assertEqual(extract_title(md), "Main Title")
 
-        
+    def test_iter_blocks_line_numbers(self):
+        md = "# Title\n\n\nFirst paragraph\ncontinued\n\n- item\n"
+        self.assertEqual(
+            list(iter_blocks(md.split("\n"))),
+            [(1, "# Title"), (4, "First paragraph\ncontinued"), (7, "- item")],
+        )
+
+    def test_iter_blocks_reads_file_lazily(self):
+        stream = io.StringIO("one\n\ntwo\n\nthree\n")
+        blocks = iter_blocks(stream)
+        self.assertEqual(next(blocks), (1, "one"))
+        self.assertEqual(stream.readline(), "two\n")
+
+    def test_markdown_to_html_node_from_file(self):
+        md = "# Title\n\nSome **bold** text\n"
+        self.assertEqual(
+            markdown_to_html_node(io.StringIO(md)).to_html(),
+            markdown_to_html_node(md).to_html(),
+        )
+
+    def test_error_reports_line_number(self):
+        with self.assertRaisesRegex(ValueError, "line 3"):
+            markdown_to_html_node("# Title\n\nan **unclosed span\n")
 
+    def test_classify_block_returns_lines_and_level(self):
+        self.assertEqual(classify_block("### Heading"), (BlockType.HEAD, None, 3))
+        self.assertEqual(classify_block("####### too deep").block_type, BlockType.PARA)
+        classified = classify_block("1. one\n2. two")
+        self.assertEqual(classified, (BlockType.O_LIST, ["1. one", "2. two"], 0))
+        self.assertEqual(extract_text_content("1. one\n2. two", classified.block_type, classified.lines), "one\ntwo")
 
+    def test_classify_block_mixed_lines(self):
+        self.assertEqual(classify_block("> quote\n- item").block_type, BlockType.PARA)
+        self.assertEqual(classify_block("1. one\n3. three").block_type, BlockType.PARA)
+        self.assertEqual(classify_block("- a\n* b").block_type, BlockType.U_LIST)
+
+    def test_parse_document_metadata(self):
+        md = """
+## Intro first
+
+# The **Real** Title
+
+Read [the docs](/docs) and see ![a map](/map.png).
+
+- one _two_
+- three
+"""
+        document = parse_document(md)
+        self.assertEqual(document.html_node.to_html(), markdown_to_html_node(md).to_html())
+        self.assertEqual(document.title, extract_title(md))
+        self.assertEqual(document.outline, [(2, "Intro first"), (1, "The Real Title")])
+        self.assertEqual(document.links, [("the docs", "/docs")])
+        self.assertEqual(document.images, [("a map", "/map.png")])
+        self.assertEqual(document.word_count, 14)
+        self.assertEqual(document.metadata()["title"], "The **Real** Title")
+        self.assertEqual(document.terms["real"], HEADING_WEIGHT)
+        self.assertEqual(document.terms["docs"], 1)
+        self.assertNotIn("map", document.terms)
+
+    def test_basepath_applies_to_links_not_code(self):
+        md = 'See [docs](/docs) and `<a href="/x">`\n\n```\n<img src="/raw.png">\n```'
+        html = markdown_to_html_node(md, basepath="/site/").to_html()
+        self.assertIn('<a href="/site/docs">docs</a>', html)
+        self.assertIn('<code><a href="/x"></code>', html)
+        self.assertIn('<img src="/raw.png">', html)
+        self.assertEqual(parse_document(md, basepath="/site/").links, [("docs", "/docs")])
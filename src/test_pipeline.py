@@ -0,0 +1,54 @@
+import threading
+import unittest
+
+from pipeline import PipelineError, run_pipeline
+
+
+class TestPipeline(unittest.TestCase):
+    def test_results_in_order(self):
+        results = list(run_pipeline(range(50), lambda x: x, lambda x: x * 2, lambda x: x + 1, depth=2))
+        self.assertEqual(results, [x * 2 + 1 for x in range(50)])
+
+    def test_read_ahead_is_bounded(self):
+        read = []
+        gate = threading.Event()
+
+        def render(value):
+            gate.wait(5)
+            return value
+
+        pipeline = run_pipeline(range(100), lambda x: read.append(x) or x, render, lambda x: x, depth=3)
+        consumer = threading.Thread(target=lambda: list(pipeline))
+        consumer.start()
+        threading.Event().wait(0.2)
+        # One item in render, three queued and one blocked on the full queue
+        self.assertLessEqual(len(read), 5)
+        gate.set()
+        consumer.join()
+        self.assertEqual(len(read), 100)
+
+    def test_failure_names_item(self):
+        def fail_on_three(value):
+            if value == 3:
+                raise ValueError("bad three")
+            return value
+
+        for stage in range(3):
+            funcs = [lambda x: x] * 3
+            funcs[stage] = fail_on_three
+            with self.subTest(stage=stage):
+                with self.assertRaises(PipelineError) as ctx:
+                    list(run_pipeline(range(10), *funcs))
+                self.assertEqual(ctx.exception.item, 3)
+                self.assertIsInstance(ctx.exception.__cause__, ValueError)
+
+    def test_closing_early_stops_threads(self):
+        before = threading.active_count()
+        pipeline = run_pipeline(range(1000), lambda x: x, lambda x: x, lambda x: x, depth=2)
+        self.assertEqual(next(pipeline), 0)
+        pipeline.close()
+        self.assertEqual(threading.active_count(), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
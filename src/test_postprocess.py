@@ -0,0 +1,79 @@
+import gzip
+import os
+import unittest
+
+from postprocess import compressed_paths, minify_css, minify_html, precompress_tree
+from test_support import TempDirTestCase
+
+
+class TestMinify(unittest.TestCase):
+    def test_collapses_whitespace_between_tags(self):
+        html = "<html>\n  <body>\n    <p>Some   <b>bold</b>\n  <i>text</i> </p>\n  </body>\n</html>\n"
+        self.assertEqual(minify_html(html), "<html><body><p>Some <b>bold</b> <i>text</i></p></body></html>")
+
+    def test_preserves_pre_and_script(self):
+        html = ('<div>\n<pre><code>def f():\n    return  1\n</code></pre>\n'
+                '<script>if (a  <  b) {}\n</script>  <p> x </p></div>')
+        self.assertEqual(
+            minify_html(html),
+            '<div><pre><code>def f():\n    return  1\n</code></pre>'
+            '<script>if (a  <  b) {}\n</script><p>x</p></div>',
+        )
+
+    def test_drops_comments_and_keeps_attributes(self):
+        html = '<p title="a  b"><!-- note -->text <!--[if IE]>ie<![endif]--></p>'
+        self.assertEqual(minify_html(html), '<p title="a  b">text <!--[if IE]>ie<![endif]--></p>')
+
+    def test_style_minified_as_css(self):
+        self.assertEqual(minify_html("<style>\n  a { color: red; }\n</style>"), "<style>a{color:red}</style>")
+
+    def test_minify_css_keeps_strings_and_selectors(self):
+        css = '/* c */ h1 , h2 > a:hover {\n  content: "a  ;  b";\n  margin : 0 auto ;\n}\n'
+        self.assertEqual(minify_css(css), 'h1,h2>a:hover{content:"a  ;  b";margin :0 auto}')
+
+
+class TestPrecompress(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.page = self.write("index.html", "<p>hello</p>" * 20)
+        self.write("images/a.png", "png")
+        self.write("archive.tar.gz", "not ours")
+
+    def test_compresses_and_skips_unchanged(self):
+        compressed, removed = precompress_tree(self.root)
+        self.assertEqual(compressed, [self.page])
+        self.assertEqual(removed, [])
+        with gzip.open(self.page + ".gz", "rt") as f:
+            self.assertEqual(f.read(), "<p>hello</p>" * 20)
+
+        self.assertEqual(precompress_tree(self.root), ([], []))
+        self.write("index.html", "<p>changed</p>")
+        os.utime(self.page, ns=(1, 1))
+        self.assertEqual(precompress_tree(self.root)[0], [self.page])
+
+    def test_removes_orphaned_siblings(self):
+        precompress_tree(self.root)
+        os.remove(self.page)
+        compressed, removed = precompress_tree(self.root)
+        self.assertEqual(compressed, [])
+        self.assertEqual(removed, compressed_paths(self.page))
+        self.assertTrue(os.path.exists(os.path.join(self.root, "archive.tar.gz")))
+
+    def test_keeps_static_siblings(self):
+        static = os.path.join(self.root, "static")
+        public = os.path.join(self.root, "public")
+        for directory in (static, public):
+            self.write(os.path.join(directory, "data.json.gz"), "static gzip")
+            self.write(os.path.join(directory, "app.js"), "var a = 1;" * 20)
+            self.write(os.path.join(directory, "app.js.gz"), "static gzip")
+        self.write(os.path.join(public, "index.html"), "<p>hello</p>" * 20)
+        compressed, removed = precompress_tree(public, static=static)
+        self.assertEqual(compressed, [os.path.join(public, "index.html")])
+        self.assertEqual(removed, [])
+        for name in ("data.json.gz", "app.js.gz"):
+            with open(os.path.join(public, name)) as f:
+                self.assertEqual(f.read(), "static gzip")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import json
+import os
+import unittest
+
+from search_index import CLIENT_NAME, INDEX_NAME, SearchIndex, shard_name
+from test_support import TempDirTestCase
+
+
+class TestSearchIndex(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.state = os.path.join(self.root, "cache", "search.json")
+        self.output = os.path.join(self.root, "public", "search")
+
+    def index(self):
+        return SearchIndex(self.state, self.output)
+
+    def read(self, name):
+        with open(os.path.join(self.output, name)) as f:
+            return json.load(f)
+
+    def test_writes_index_and_prefix_shards(self):
+        search = self.index()
+        search.update_page("a.md", "h1", "/a.html", "A", {"python": 5, "pyramid": 1})
+        search.update_page("b.md", "h2", "/b.html", "B", {"python": 1, "snake": 2})
+        search.write()
+
+        index = self.read(INDEX_NAME)
+        self.assertEqual(index["pages"], [["/a.html", "A"], ["/b.html", "B"]])
+        self.assertEqual(index["shards"], ["py", "sn"])
+        self.assertEqual(self.read(shard_name("py")), {"python": [0, 5, 1, 1], "pyramid": [0, 1]})
+        self.assertEqual(self.read(shard_name("sn")), {"snake": [1, 2]})
+        self.assertTrue(os.path.exists(os.path.join(self.output, CLIENT_NAME)))
+
+    def test_incremental_update_only_touches_affected_shards(self):
+        search = self.index()
+        search.update_page("a.md", "h1", "/a.html", "A", {"python": 1})
+        search.update_page("b.md", "h2", "/b.html", "B", {"snake": 1})
+        search.write()
+
+        search = self.index()
+        self.assertFalse(search.needs_update("b.md", "h2"))
+        self.assertTrue(search.needs_update("a.md", "h3"))
+        search.update_page("a.md", "h3", "/a.html", "A", {"ruby": 2})
+        search.retain(["a.md", "b.md"])
+        written = search.write()
+
+        self.assertEqual(written, [os.path.join(self.output, shard_name("ru"))])
+        self.assertFalse(os.path.exists(os.path.join(self.output, shard_name("py"))))
+        self.assertEqual(self.read(shard_name("ru")), {"ruby": [0, 2]})
+        self.assertEqual(self.read(shard_name("sn")), {"snake": [1, 1]})
+        self.assertEqual(self.read(INDEX_NAME)["shards"], ["ru", "sn"])
+
+    def test_removed_pages_free_their_ids(self):
+        search = self.index()
+        search.update_page("a.md", "h1", "/a.html", "A", {"shared": 1})
+        search.update_page("b.md", "h2", "/b.html", "B", {"shared": 1})
+        search.write()
+
+        search = self.index()
+        search.retain(["b.md"])
+        search.write()
+        self.assertEqual(self.read(INDEX_NAME)["pages"], [None, ["/b.html", "B"]])
+        self.assertEqual(self.read(shard_name("sh")), {"shared": [1, 1]})
+
+        search = self.index()
+        search.update_page("c.md", "h3", "/c.html", "C", {"shared": 3})
+        search.retain(["b.md", "c.md"])
+        search.write()
+        self.assertEqual(self.read(INDEX_NAME)["pages"], [["/c.html", "C"], ["/b.html", "B"]])
+        self.assertEqual(self.read(shard_name("sh")), {"shared": [1, 1, 0, 3]})
+
+    def test_missing_output_resets_state(self):
+        search = self.index()
+        search.update_page("a.md", "h1", "/a.html", "A", {"python": 1})
+        search.write()
+        os.remove(os.path.join(self.output, INDEX_NAME))
+        self.assertTrue(self.index().needs_update("a.md", "h1"))
+
+
+if __name__ == "__main__":
+    unittest.main()
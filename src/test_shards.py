@@ -0,0 +1,90 @@
+import json
+import os
+import unittest
+
+import main
+from main import discover_pages, generate_pages_recursive
+from shards import (SHARD_MANIFEST_NAME, merge_shards, parse_shard, select_shard, shard_of,
+                    write_shard_manifest)
+from test_support import TempDirTestCase
+
+
+class TestShards(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.content = os.path.join(self.root, "content")
+        self.template = os.path.join(self.root, "template.html")
+        self.write(self.template, "<main>{{ Content }}</main>")
+        for index in range(12):
+            self.write(os.path.join(self.content, f"post{index}", "index.md"), f"# Post {index}")
+
+    def build_shard(self, shard):
+        dest = os.path.join(self.root, f"shard{shard[0]}")
+        generate_pages_recursive(self.content, self.template, dest, "/", shard=shard)
+        self.write(os.path.join(dest, "index.css"), "body {}")
+        write_shard_manifest(dest, self.content, discover_pages(self.content, dest), shard)
+        return dest
+
+    def test_parse_shard(self):
+        self.assertEqual(parse_shard("2/4"), (2, 4))
+        for text in ("0/4", "5/4", "1/0", "a/b", "3"):
+            with self.assertRaises(ValueError):
+                parse_shard(text)
+
+    def test_partition_is_stable_and_complete(self):
+        pages = discover_pages(self.content, "public")
+        shards = [select_shard(pages, self.content, (index, 3)) for index in (1, 2, 3)]
+        self.assertEqual(sorted(page for shard in shards for page in shard), sorted(pages))
+        self.assertTrue(all(shards))
+        # Only the path relative to the content directory matters
+        self.assertEqual(shard_of(os.path.join(self.content, "post1", "index.md"), self.content, 3),
+                         shard_of(os.path.join("elsewhere", "post1", "index.md"), "elsewhere", 3))
+
+    def test_merge_combines_shards(self):
+        dirs = [self.build_shard((index, 3)) for index in (1, 2, 3)]
+        dest = os.path.join(self.root, "public")
+        self.assertEqual(merge_shards(dirs, dest), 13)
+        self.assertEqual(len(discover_pages(self.content, dest)), 12)
+        with open(os.path.join(dest, "post7", "index.html")) as f:
+            self.assertEqual(f.read(), "<main><div><h1>Post 7</h1></div></main>")
+        self.assertFalse(os.path.exists(os.path.join(dest, SHARD_MANIFEST_NAME)))
+
+    def test_stale_pages_of_other_shards_are_not_merged(self):
+        dirs = [self.build_shard((index, 3)) for index in (1, 2, 3)]
+        # A full build left every page in shard 1's directory before it was rebuilt as a shard
+        generate_pages_recursive(self.content, self.template, dirs[0], "/")
+        self.write(os.path.join(dirs[0], "post7", "index.html"), "stale")
+        self.write(os.path.join(dirs[0], "post7", "index.html.gz"), "stale")
+        write_shard_manifest(dirs[0], self.content, discover_pages(self.content, dirs[0]), (1, 3))
+        dest = os.path.join(self.root, "public")
+        self.assertEqual(merge_shards(dirs, dest), 13)
+        with open(os.path.join(dest, "post7", "index.html")) as f:
+            self.assertEqual(f.read(), "<main><div><h1>Post 7</h1></div></main>")
+
+    def test_merge_error_exits_with_message(self):
+        with self.assertRaisesRegex(SystemExit, "no .shard.json"):
+            main.main(["--merge", os.path.join(self.root, "missing")])
+
+    def test_merge_rejects_gaps_and_collisions(self):
+        dirs = [self.build_shard((index, 3)) for index in (1, 2, 3)]
+        dest = os.path.join(self.root, "public")
+        with self.assertRaisesRegex(ValueError, "missing shards: 2/3"):
+            merge_shards([dirs[0], dirs[2]], dest)
+
+        self.write(os.path.join(dirs[1], "index.css"), "body { color: red }")
+        write_shard_manifest(dirs[1], self.content, discover_pages(self.content, dirs[1]), (2, 3))
+        with self.assertRaisesRegex(ValueError, "index.css differs"):
+            merge_shards(dirs, dest)
+
+        with open(os.path.join(dirs[2], SHARD_MANIFEST_NAME)) as f:
+            data = json.load(f)
+        data["pages"]["extra.md"] = "extra.html"
+        with open(os.path.join(dirs[2], SHARD_MANIFEST_NAME), "w") as f:
+            json.dump(data, f)
+        with self.assertRaisesRegex(ValueError, "13 pages but 12"):
+            merge_shards([dirs[0], self.build_shard((2, 3)), dirs[2]], dest)
+        self.assertFalse(os.path.exists(dest))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import os
+import unittest
+from unittest import mock
+
+import site_index
+from site_index import FEED_NAME, SITEMAP_NAME, SiteIndex, sitemap_chunk_name
+from test_support import TempDirTestCase
+
+JAN = 1767225600  # 2026-01-01T00:00:00Z
+FEB = 1769904000  # 2026-02-01T00:00:00Z
+
+
+class TestSiteIndex(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.state = os.path.join(self.root, "cache", "pages.json")
+        self.dest = os.path.join(self.root, "public")
+
+    def index(self):
+        return SiteIndex(self.state, self.dest, "https://example.com/", "/site/")
+
+    def read(self, name):
+        with open(os.path.join(self.dest, name)) as f:
+            return f.read()
+
+    def test_sitemap_and_feed(self):
+        index = self.index()
+        index.update_page("index.md", "h1", "/site/index.html", "Home & Away", JAN)
+        index.update_page("blog.md", "h2", "/site/blog.html", "Blog", FEB)
+        index.write()
+
+        sitemap = self.read(SITEMAP_NAME)
+        self.assertIn("<url><loc>https://example.com/site/blog.html</loc>"
+                      "<lastmod>2026-02-01T00:00:00+00:00</lastmod></url>", sitemap)
+        self.assertLess(sitemap.index("blog.html"), sitemap.index("index.html"))
+
+        feed = self.read(FEED_NAME)
+        self.assertIn("<title>Home &amp; Away</title>", feed)
+        self.assertIn("<updated>2026-02-01T00:00:00+00:00</updated>", feed)
+        self.assertLess(feed.index("<entry><title>Blog</title>"), feed.index("<entry><title>Home &amp; Away"))
+        self.assertIn("<author><name>Home &amp; Away</name></author>", feed)
+
+    def test_feed_author(self):
+        index = self.index()
+        index.update_page("index.md", "h1", "/site/index.html", "Home", JAN)
+        index.write()
+        self.assertIn("<author><name>Home</name></author>", self.read(FEED_NAME))
+
+        index = SiteIndex(self.state, self.dest, "https://example.com/", "/site/", "Jo <jo@example.com>")
+        index.retain(["index.md"])
+        self.assertIn(os.path.join(self.dest, FEED_NAME), index.write())
+        self.assertIn("<author><name>Jo &lt;jo@example.com&gt;</name></author>", self.read(FEED_NAME))
+
+    def test_unchanged_pages_write_nothing(self):
+        index = self.index()
+        index.update_page("index.md", "h1", "/site/index.html", "Home", JAN)
+        index.update_page("blog.md", "h2", "/site/blog.html", "Blog", FEB)
+        self.assertEqual(len(index.write()), 2)
+
+        index = self.index()
+        self.assertFalse(index.needs_update("index.md", "h1"))
+        self.assertTrue(index.needs_update("index.md", "h3"))
+        index.retain(["index.md", "blog.md"])
+        self.assertEqual(index.write(), [])
+
+        index = self.index()
+        index.retain(["index.md"])
+        self.assertEqual(len(index.write()), 2)
+        self.assertNotIn("blog.html", self.read(SITEMAP_NAME))
+
+    def test_large_sites_get_a_sitemap_index(self):
+        index = self.index()
+        for number in range(5):
+            index.update_page(f"{number}.md", "h", f"/site/{number}.html", str(number), JAN)
+        with mock.patch.object(site_index, "SITEMAP_LIMIT", 2):
+            index.write()
+        self.assertIn("<loc>https://example.com/site/sitemap-3.xml</loc>", self.read(SITEMAP_NAME))
+        self.assertIn("/site/4.html", self.read(sitemap_chunk_name(3)))
+
+        index = self.index()
+        index.retain(["0.md"])
+        index.write()
+        self.assertFalse(os.path.exists(os.path.join(self.dest, sitemap_chunk_name(1))))
+        self.assertIn("/site/0.html", self.read(SITEMAP_NAME))
+
+
+if __name__ == "__main__":
+    unittest.main()
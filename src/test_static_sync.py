@@ -0,0 +1,89 @@
+import os
+import unittest
+
+from static_sync import sync_tree
+from test_support import TempDirTestCase
+
+
+class TestSyncTree(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.source = os.path.join(self.root, "static")
+        self.dest = os.path.join(self.root, "public")
+        self.record = os.path.join(self.root, "cache", "static.json")
+        self.write(self.source, "index.css", "body {}")
+        self.write(self.source, "images/a.png", "png-a")
+        self.write(self.source, "images/b.png", "png-b")
+
+    def write(self, root, relative, text):
+        return super().write(os.path.join(root, relative), text)
+
+    def test_first_sync_copies_everything(self):
+        copied, removed = sync_tree(self.source, self.dest, self.record)
+        self.assertEqual(len(copied), 3)
+        self.assertEqual(removed, [])
+        with open(os.path.join(self.dest, "images", "a.png")) as f:
+            self.assertEqual(f.read(), "png-a")
+
+    def test_transforms_use_the_record(self):
+        transforms = {".css": lambda text: text.replace(" ", "")}
+        copied, _ = sync_tree(self.source, self.dest, self.record, transforms=transforms)
+        self.assertEqual(len(copied), 3)
+        with open(os.path.join(self.dest, "index.css")) as f:
+            self.assertEqual(f.read(), "body{}")
+
+        copied, _ = sync_tree(self.source, self.dest, self.record, transforms=transforms)
+        self.assertEqual(copied, [])
+        # Dropping the transform copies the original again
+        copied, _ = sync_tree(self.source, self.dest, self.record)
+        self.assertEqual(copied, [os.path.join(self.dest, "index.css")])
+
+    def test_second_sync_copies_only_changes(self):
+        sync_tree(self.source, self.dest, self.record)
+        path = self.write(self.source, "images/a.png", "png-a-changed")
+        os.utime(path, ns=(1, 1))
+
+        copied, removed = sync_tree(self.source, self.dest, self.record)
+        self.assertEqual(copied, [os.path.join(self.dest, "images", "a.png")])
+        self.assertEqual(removed, [])
+
+    def test_stale_files_removed_but_pages_kept(self):
+        sync_tree(self.source, self.dest, self.record)
+        page = self.write(self.dest, "index.html", "<p>generated</p>")
+        os.remove(os.path.join(self.source, "images", "b.png"))
+
+        copied, removed = sync_tree(self.source, self.dest, self.record)
+        self.assertEqual(copied, [])
+        self.assertEqual(removed, [os.path.join(self.dest, "images", "b.png")])
+        self.assertTrue(os.path.exists(page))
+
+    def test_link_mode_shares_inode(self):
+        sync_tree(self.source, self.dest, self.record, link=True)
+        source_stat = os.stat(os.path.join(self.source, "index.css"))
+        dest_stat = os.stat(os.path.join(self.dest, "index.css"))
+        self.assertEqual(source_stat.st_ino, dest_stat.st_ino)
+        self.assertEqual(sync_tree(self.source, self.dest, self.record, link=True), ([], []))
+
+    def test_replaced_files_drop_precompressed_siblings(self):
+        sync_tree(self.source, self.dest, self.record)
+        self.write(self.dest, "index.css.gz", "old")
+        self.write(self.dest, "images/a.png.br", "old")
+        self.write(self.source, "images/a.png.br", "shipped")
+        self.write(self.source, "index.css", "body { color: red }")
+        self.write(self.source, "images/a.png", "png-a2")
+        sync_tree(self.source, self.dest, self.record)
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "index.css.gz")))
+        with open(os.path.join(self.dest, "images", "a.png.br")) as f:
+            self.assertEqual(f.read(), "shipped")
+
+    def test_ignore_patterns(self):
+        self.write(self.source, "index.css~", "backup")
+        self.write(self.source, "drafts/c.png", "png-c")
+        copied, _ = sync_tree(self.source, self.dest, self.record, ignore=("*~", "drafts"))
+        self.assertEqual(len(copied), 3)
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "index.css~")))
+        self.assertFalse(os.path.exists(os.path.join(self.dest, "drafts")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,23 @@
+import os
+import tempfile
+import unittest
+
+
+class TempDirTestCase(unittest.TestCase):
+
+    """TestCase with a fresh temporary directory, self.root, removed after each test"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = self.tmp.name
+
+    def write(self, path, text="x"):
+
+        """Write text to path (relative to self.root unless absolute), creating its directories"""
+
+        path = os.path.join(self.root, path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(text)
+        return path
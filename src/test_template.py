@@ -0,0 +1,95 @@
+import io
+import os
+import unittest
+
+from template import PageTemplate, TemplateLoader, rewrite_urls
+from test_support import TempDirTestCase
+
+
+class TestPageTemplate(unittest.TestCase):
+    def test_render_fills_slots(self):
+        template = PageTemplate("<title>{{ Title }}</title><body>{{ Content }}</body>")
+        self.assertEqual(template.slots, ["Title", "Content"])
+        self.assertEqual(
+            template.render(Title="Home", Content="<p>hi</p>"),
+            "<title>Home</title><body><p>hi</p></body>",
+        )
+
+    def test_missing_value_renders_empty(self):
+        template = PageTemplate("<title>{{ Title }}</title>")
+        self.assertEqual(template.render(), "<title></title>")
+
+    def test_repeated_and_unknown_slots(self):
+        template = PageTemplate("{{ Title }}|{{ Title }}|{{ Other }}")
+        self.assertEqual(template.render(Title="x"), "x|x|{{ Other }}")
+
+    def test_basepath_applied_at_compile_time(self):
+        template = PageTemplate('<link href="/index.css"><img src="/a.png">{{ Content }}', "/site/")
+        self.assertEqual(template.segments[0], '<link href="/site/index.css"><img src="/site/a.png">')
+        self.assertEqual(template.render(Content="x"), '<link href="/site/index.css"><img src="/site/a.png">x')
+
+    def test_assets_applied_at_compile_time(self):
+        assets = {"/index.css": "/index.0123456789.css"}
+        template = PageTemplate('<link href="/index.css"><a href="/about">{{ Content }}', "/site/", assets=assets)
+        self.assertEqual(template.segments[0], '<link href="/site/index.0123456789.css"><a href="/site/about">')
+        plain = PageTemplate('<link href="/index.css"><a href="/about">{{ Content }}', "/site/")
+        self.assertNotEqual(template.digest, plain.digest)
+
+    def test_render_to_accepts_chunks(self):
+        template = PageTemplate("<title>{{ Title }}</title><body>{{ Content }}</body>")
+        stream = io.StringIO()
+        template.render_to(stream, Title="Home", Content=iter(["<p>", "hi", "</p>"]))
+        self.assertEqual(stream.getvalue(), "<title>Home</title><body><p>hi</p></body>")
+
+    def test_rewrite_urls(self):
+        self.assertEqual(rewrite_urls('<a href="/x">', "/"), '<a href="/x">')
+        self.assertEqual(rewrite_urls('<a href="/x">', "/b/"), '<a href="/b/x">')
+
+
+class TestPartials(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.site = self.write("template.html", "{{> header }}<main>{{ Content }}</main>")
+        self.write("partials/header.html", '<header>{{> nav/links }}</header>')
+        self.write("partials/nav/links.html", '<a href="/">home</a>')
+
+    def test_partials_expanded_recursively(self):
+        template = PageTemplate.load(self.site, "/site/")
+        self.assertEqual(template.render(Content="x"),
+                         '<header><a href="/site/">home</a></header><main>x</main>')
+        self.assertEqual(template.dependencies, [
+            os.path.normpath(self.site),
+            os.path.join(self.root, "partials", "header.html"),
+            os.path.join(self.root, "partials", "nav", "links.html"),
+        ])
+
+    def test_digest_follows_partials(self):
+        before = PageTemplate.load(self.site).digest
+        self.assertEqual(PageTemplate.load(self.site).digest, before)
+        self.write("partials/nav/links.html", "<nav></nav>")
+        self.assertNotEqual(PageTemplate.load(self.site).digest, before)
+
+    def test_missing_partial_and_cycle(self):
+        self.write("partials/nav/links.html", "{{> missing }}")
+        with self.assertRaisesRegex(ValueError, "missing.html not found"):
+            PageTemplate.load(self.site)
+
+        self.write("partials/nav/links.html", "{{> header }}")
+        with self.assertRaisesRegex(ValueError, "cycle"):
+            PageTemplate.load(self.site)
+
+    def test_loader_picks_nearest_template(self):
+        content = os.path.join(self.root, "content")
+        blog_template = self.write("content/blog/template.html", "<article>{{ Content }}</article>")
+        loader = TemplateLoader(self.site, content)
+
+        self.assertEqual(loader.path_for(os.path.join(content, "index.md")), os.path.normpath(self.site))
+        self.assertEqual(loader.path_for(os.path.join(content, "blog", "a", "index.md")), blog_template)
+        self.assertIs(loader.template_for(os.path.join(content, "blog", "b.md")), loader.get(blog_template))
+        self.assertTrue(loader.is_template(blog_template))
+        self.assertTrue(loader.is_template(os.path.join(self.root, "partials", "header.html")))
+        self.assertFalse(loader.is_template(os.path.join(content, "blog", "a", "index.md")))
+
+
+if __name__ == "__main__":
+    unittest.main()
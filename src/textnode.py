@@ -10,6 +10,7 @@ class TextType(Enum):
 
 
 class TextNode():
+    __slots__ = ("text", "text_type", "url")
 
     def __init__(self, text, text_type, url = None):
         self.text = text